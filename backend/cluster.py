@@ -0,0 +1,107 @@
+"""Sticky room routing: each room is owned by one worker, chosen by consistent hashing.
+
+Every worker is configured with the same list of worker base URLs and places
+each of them on a hash ring at `vnodes` points. A room belongs to the worker
+at the first point at or after hash(room_code), so all workers agree on the
+owner without talking to each other, and adding or removing a worker only
+moves the rooms in the ring segments it gains or loses (about 1/N of them).
+
+Requests for a room owned by another worker are redirected there, which keeps
+the room in exactly one process's rooms dict. When the worker list changes,
+each worker hands off the rooms it no longer owns by writing them to Mongo and
+dropping them; the new owner loads them on the next request. A worker that is
+left out of its own list owns nothing, which is how one is drained.
+"""
+import bisect
+import hashlib
+import os
+from typing import Iterable, List, Optional
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring over a set of nodes"""
+
+    def __init__(self, nodes: Iterable[str], vnodes: int = 64):
+        self.nodes = tuple(sorted(set(nodes)))
+        points = sorted((_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes))
+        self._hashes = [h for h, _ in points]
+        self._owners = [node for _, node in points]
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._hashes:
+            return None
+        index = bisect.bisect_left(self._hashes, _hash(key)) % len(self._hashes)
+        return self._owners[index]
+
+
+class RoomRouter:
+    """Which worker owns each room code.
+
+    Workers come from `workers` or, when set, from `workers_file` (one base URL
+    per line), which is re-read by refresh() whenever it changes on disk. With
+    no workers configured routing is off and every room is local.
+    """
+
+    def __init__(self, self_url: Optional[str], workers: Iterable[str] = (),
+                 workers_file: Optional[str] = None, check_interval: float = 5.0, vnodes: int = 64):
+        self.self_url = self_url.rstrip("/") if self_url else None
+        self.workers_file = workers_file
+        self.check_interval = check_interval
+        self.vnodes = vnodes
+        self._static_workers = self._normalize(workers)
+        self._file_version = None
+        self.ring = HashRing(self._read_workers(), vnodes)
+        if self.enabled and not self.self_url:
+            raise ValueError("CLUSTER_SELF_URL is required when cluster workers are configured")
+
+    @property
+    def enabled(self) -> bool:
+        return len(self.ring) > 0
+
+    @property
+    def is_member(self) -> bool:
+        """Whether this worker owns part of the ring (always, with routing off)"""
+        return not self.enabled or self.self_url in self.ring.nodes
+
+    def owner(self, room_code: str) -> Optional[str]:
+        return self.ring.owner(room_code)
+
+    def is_local(self, room_code: str) -> bool:
+        return not self.enabled or self.ring.owner(room_code) == self.self_url
+
+    def refresh(self) -> bool:
+        """Re-read the workers file if it changed; True when the ring changed"""
+        if not self.workers_file:
+            return False
+        workers = self._read_workers()
+        if tuple(sorted(set(workers))) == self.ring.nodes:
+            return False
+        self.ring = HashRing(workers, self.vnodes)
+        return True
+
+    def _read_workers(self) -> List[str]:
+        if not self.workers_file:
+            return self._static_workers
+        try:
+            stat = os.stat(self.workers_file)
+            version = (stat.st_size, stat.st_mtime_ns)
+            if version == self._file_version:
+                return list(self.ring.nodes)
+            with open(self.workers_file) as f:
+                workers = self._normalize(line for line in f if not line.lstrip().startswith("#"))
+        except OSError:
+            # Missing or unreadable file: keep the current workers
+            return list(self.ring.nodes) if self._file_version else self._static_workers
+        self._file_version = version
+        return workers
+
+    @staticmethod
+    def _normalize(workers: Iterable[str]) -> List[str]:
+        return [url.strip().rstrip("/") for url in workers if url.strip()]
@@ -0,0 +1,111 @@
+"""In-process leaderboard mirroring the rankings collection.
+
+Every player's ranking is kept in memory, together with a list of
+(-points, player_id) keys in sorted order. Top-N pages, offsets and a
+player's own rank are bisect lookups, and a game result moves only the
+affected entries. Reconciling against Mongo periodically picks up changes
+made by other workers; it merges what it reads instead of replacing the
+board, so results recorded while the read is in flight are not lost.
+"""
+import bisect
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class Leaderboard:
+    """All player rankings ordered by points (highest first)"""
+
+    def __init__(self):
+        self._entries: Dict[str, Dict] = {}
+        self._order: List[Tuple[int, str]] = []
+        self.loaded_at: Optional[datetime] = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    def merge(self, rankings: Iterable[Dict]):
+        """Bring entries up to date with ranking documents read from Mongo.
+
+        A read can race with record_result: an entry whose games_played is
+        already ahead of its document was updated after the read and is kept,
+        and players missing from the documents are left as they are.
+        """
+        changed = []
+        for ranking in rankings:
+            entry = self._entries.get(ranking["player_id"])
+            if entry is not None and entry["games_played"] > ranking.get("games_played", 0):
+                entry["id"] = str(ranking["_id"])
+                continue
+            changed.append((entry, {
+                "id": str(ranking["_id"]),
+                "player_id": ranking["player_id"],
+                "username": ranking["username"],
+                "points": ranking.get("points", 0),
+                "games_played": ranking.get("games_played", 0),
+                "games_won": ranking.get("games_won", 0),
+                "last_played": ranking.get("last_played")
+            }))
+
+        if len(changed) * 8 > len(self._order):
+            # Large batch (e.g. the first load): re-sorting beats one insort per entry
+            for _, fresh in changed:
+                self._entries[fresh["player_id"]] = fresh
+            self._order = sorted(self._key(entry) for entry in self._entries.values())
+            return
+        for entry, fresh in changed:
+            if entry is not None:
+                self._remove_key(entry)
+            self._entries[fresh["player_id"]] = fresh
+            bisect.insort(self._order, self._key(fresh))
+
+    def mark_loaded(self):
+        """Record that a full pass over the rankings collection was merged"""
+        self.loaded_at = datetime.utcnow()
+
+    def record_result(self, player_id: str, username: str, won: bool,
+                      played_at: datetime, ranking_id: Optional[str] = None):
+        """Apply one game result (same increments as the Mongo update)"""
+        entry = self._entries.get(player_id)
+        if entry is None:
+            entry = self._entries[player_id] = {
+                "id": ranking_id or player_id,
+                "player_id": player_id,
+                "username": username,
+                "points": 0,
+                "games_played": 0,
+                "games_won": 0,
+                "last_played": None
+            }
+        else:
+            self._remove_key(entry)
+
+        entry["games_played"] += 1
+        entry["games_won"] += 1 if won else 0
+        entry["points"] += 3 if won else 1
+        entry["last_played"] = played_at
+        bisect.insort(self._order, self._key(entry))
+
+    def top(self, limit: int, offset: int = 0) -> List[Dict]:
+        """Entries ranked offset+1 .. offset+limit"""
+        return [self._entries[player_id] for _, player_id in self._order[offset:offset + limit]]
+
+    def rank(self, player_id: str) -> Optional[Tuple[int, Dict]]:
+        """1-based rank and entry of a player, or None if they have no ranking"""
+        entry = self._entries.get(player_id)
+        if entry is None:
+            return None
+        return bisect.bisect_left(self._order, self._key(entry)) + 1, entry
+
+    def _remove_key(self, entry: Dict):
+        key = self._key(entry)
+        index = bisect.bisect_left(self._order, key)
+        if index < len(self._order) and self._order[index] == key:
+            del self._order[index]
+
+    @staticmethod
+    def _key(entry: Dict) -> Tuple[int, str]:
+        return -entry["points"], entry["player_id"]
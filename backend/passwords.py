@@ -0,0 +1,219 @@
+"""Password hashing off the event loop.
+
+A bcrypt hash or verify burns tens of milliseconds of CPU. Called inline from
+an async handler it stalls every WebSocket game on the worker, so all hashing
+goes through a PasswordHasher, which runs it in a bounded pool:
+
+    thread   (default) bcrypt releases the GIL while hashing, so threads run
+             hashes in parallel with the event loop and with each other
+    process  separate processes, for hash backends that hold the GIL
+
+Calls beyond the pool size wait in the executor queue; queued/in_flight and
+the high-water mark are exposed for monitoring. With max_pending set, calls
+arriving while that many are already in flight fail fast with
+PasswordHasherBusy instead of queueing (load shedding).
+
+build_password_context() is the hash policy: the cost is picked by timing
+hashes on this machine against a latency budget (never below the old default),
+and stored hashes that are weaker (or from another scheme) report needs_update
+so a successful login can rehash them. Stronger hashes are left alone, so
+workers whose benchmarks differ never rehash an account back and forth.
+"""
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from passlib.context import CryptContext
+
+try:
+    from passlib.hash import argon2 as _argon2
+    ARGON2_AVAILABLE = _argon2.has_backend()  # needs argon2-cffi
+except ImportError:  # pragma: no cover - very old passlib
+    ARGON2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+POOL_KINDS = ("thread", "process")
+HASH_SCHEMES = ("bcrypt", "argon2")
+BCRYPT_MIN_ROUNDS = 12  # passlib's default; never go below it, whatever the benchmark says
+BCRYPT_MAX_ROUNDS = 16
+ARGON2_MIN_TIME_COST = 2  # passlib's default
+ARGON2_MAX_TIME_COST = 10
+
+# Contexts rebuilt inside pool processes, keyed by their config string
+_process_contexts: Dict[str, CryptContext] = {}
+
+
+def _process_context(config: str) -> CryptContext:
+    context = _process_contexts.get(config)
+    if context is None:
+        context = _process_contexts[config] = CryptContext.from_string(config)
+    return context
+
+
+def _process_hash(config: str, password: str) -> str:
+    return _process_context(config).hash(password)
+
+
+def _process_verify(config: str, password: str, hashed: str) -> bool:
+    return _process_context(config).verify(password, hashed)
+
+
+def _process_verify_and_update(config: str, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return _process_context(config).verify_and_update(password, hashed)
+
+
+def _time_hash(context: CryptContext, samples: int = 3) -> float:
+    """Best-of-n seconds per hash"""
+    best = float("inf")
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.hash("benchmark-password")
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def benchmark_bcrypt_rounds(target_ms: float) -> int:
+    """Highest bcrypt cost whose hash time fits in target_ms (each round doubles the work),
+    but at least BCRYPT_MIN_ROUNDS"""
+    rounds = BCRYPT_MIN_ROUNDS
+    elapsed = _time_hash(CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds))
+    while rounds < BCRYPT_MAX_ROUNDS and elapsed * 2 * 1000 <= target_ms:
+        rounds += 1
+        elapsed *= 2
+    return rounds
+
+
+def benchmark_argon2_time_cost(target_ms: float, memory_kib: int) -> int:
+    """Highest argon2 time cost (passes over memory_kib) that fits in target_ms"""
+    elapsed = _time_hash(CryptContext(schemes=["argon2"], argon2__time_cost=1, argon2__memory_cost=memory_kib))
+    return max(ARGON2_MIN_TIME_COST, min(ARGON2_MAX_TIME_COST, int(target_ms / (elapsed * 1000))))
+
+
+def build_password_context(scheme: str = "bcrypt", target_ms: float = 250, rounds: Optional[int] = None,
+                           argon2_memory_kib: int = 65536) -> Tuple[CryptContext, Dict]:
+    """The hash policy: a CryptContext and a description of what was chosen.
+
+    New hashes use `scheme` at a cost fitted to target_ms (or the given
+    rounds/time cost), never below the minimum. Hashes from the other scheme
+    still verify but are deprecated, and hashes of this scheme below that cost
+    are under min_rounds, so either way needs_update() is true for them;
+    hashes at a higher cost stay as they are.
+    """
+    if scheme not in HASH_SCHEMES:
+        raise ValueError(f"Unknown password hash scheme: {scheme} (expected one of {HASH_SCHEMES})")
+    if scheme == "argon2" and not ARGON2_AVAILABLE:
+        logger.warning("argon2 requested but argon2-cffi is not installed; using bcrypt")
+        scheme = "bcrypt"
+
+    started = time.perf_counter()
+    settings = {}
+    if scheme == "bcrypt":
+        rounds = max(BCRYPT_MIN_ROUNDS, rounds or benchmark_bcrypt_rounds(target_ms))
+        settings.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+        policy = {"scheme": "bcrypt", "rounds": rounds}
+    else:
+        time_cost = max(ARGON2_MIN_TIME_COST, rounds or benchmark_argon2_time_cost(target_ms, argon2_memory_kib))
+        settings.update(argon2__default_rounds=time_cost, argon2__min_rounds=time_cost,
+                        argon2__memory_cost=argon2_memory_kib)
+        policy = {"scheme": "argon2", "time_cost": time_cost, "memory_kib": argon2_memory_kib}
+
+    schemes = [scheme] + [other for other in HASH_SCHEMES
+                          if other != scheme and (other != "argon2" or ARGON2_AVAILABLE)]
+    context = CryptContext(schemes=schemes, default=scheme, deprecated=schemes[1:], **settings)
+    policy["hash_ms"] = round(_time_hash(context, samples=1) * 1000, 1)
+    policy["target_ms"] = target_ms
+    policy["configured_in_ms"] = round((time.perf_counter() - started) * 1000)
+    return context, policy
+
+
+class PasswordHasherBusy(Exception):
+    """Too many hashes in flight; the caller should retry later"""
+
+
+class PasswordHasher:
+    """Runs a CryptContext's hash/verify in a bounded worker pool"""
+
+    def __init__(self, context: CryptContext, workers: int = 2, kind: str = "thread", max_pending: int = 0):
+        if kind not in POOL_KINDS:
+            raise ValueError(f"Unknown password hash pool: {kind} (expected one of {POOL_KINDS})")
+        self.set_context(context)
+        self.policy: Dict = {}
+        self.workers = max(1, workers)
+        self.kind = kind
+        self.max_pending = max_pending  # 0: unbounded queue
+        self._executor: Optional[Executor] = None
+        self.in_flight = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def set_context(self, context: CryptContext, policy: Optional[Dict] = None):
+        """Switch to another hash policy (later calls use it)"""
+        self.context = context
+        self._config = context.to_string()  # how pool processes rebuild the context
+        if policy is not None:
+            self.policy = policy
+
+    @property
+    def queued(self) -> int:
+        """Calls waiting for a free pool worker"""
+        return max(0, self.in_flight - self.workers)
+
+    def stats(self) -> Dict:
+        return {
+            "policy": self.policy,
+            "pool": self.kind,
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected
+        }
+
+    async def hash(self, password: str) -> str:
+        if self.kind == "process":
+            return await self._run(_process_hash, self._config, password)
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        if self.kind == "process":
+            return await self._run(_process_verify, self._config, password, hashed)
+        return await self._run(self.context.verify, password, hashed)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Verify, and if the stored hash is out of policy also return a fresh hash for it"""
+        if self.kind == "process":
+            return await self._run(_process_verify_and_update, self._config, password, hashed)
+        return await self._run(self.context.verify_and_update, password, hashed)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _run(self, fn, *args):
+        if self.max_pending and self.in_flight >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        self.in_flight += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+
+def default_workers() -> int:
+    return min(4, os.cpu_count() or 1)
@@ -0,0 +1,281 @@
+"""Question bank stored as JSON Lines and read through a memory map.
+
+File layout (UTF-8, one JSON document per line):
+
+    {"format": "question-bank", "version": 1, "subjects": {"historia": {"offset": 0, "length": 5120, "count": 60}, ...}}
+    {"id": 1, "question": "...", "options": [...], "correctAnswer": "...", "period": "...", "subject": "historia"}
+    ...
+
+The first line is a manifest; every other line is one question. Questions are
+grouped by subject, and each subject's ``offset``/``length`` is a byte range
+relative to the end of the manifest line. Opening a bank only decodes the
+manifest; a subject's line offsets are found the first time it is used, and a
+question is only decoded when it is drawn.
+
+Rebuild a bank after editing its question lines with:
+
+    python question_bank.py build data/questions.jsonl
+"""
+import bisect
+import json
+import mmap
+import os
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+BANK_FORMAT = "question-bank"
+BANK_VERSION = 1
+
+DEFAULT_BANK_PATH = Path(__file__).parent / "data" / "questions.jsonl"
+
+# Question fields that can be used to filter paged listings. Bank questions
+# have no separate "topic": for quimica and matematica the topic is stored in
+# "period" (e.g. "Tabela Periódica", "Geometria"), so filter on that; add a
+# field here once questions carry it.
+INDEXED_FIELDS = ("period",)
+
+
+def _file_version(stat: os.stat_result) -> str:
+    return f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+
+class QuestionBank:
+    """Read-only, lazily decoded view over a question bank file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size == 0:
+                raise ValueError(f"Empty question bank: {self.path}")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Identifies this exact file contents for cache invalidation
+        self.version = _file_version(stat)
+
+        header_end = self._mm.find(b"\n")
+        if header_end < 0:
+            header_end = len(self._mm)
+        manifest = json.loads(self._mm[:header_end])
+        if manifest.get("format") != BANK_FORMAT or manifest.get("version") != BANK_VERSION:
+            raise ValueError(f"Unsupported question bank format in {self.path}")
+
+        self._data_start = header_end + 1
+        self._subjects: Dict[str, Dict[str, int]] = manifest["subjects"]
+        self._offsets: Dict[str, array] = {}
+        self._indexes: Dict[str, "SubjectIndex"] = {}
+
+    def close(self):
+        self._mm.close()
+
+    def subjects(self) -> List[str]:
+        return list(self._subjects)
+
+    def count(self, subject: Optional[str] = None) -> int:
+        """Number of questions for a subject (all subjects when None)"""
+        if subject is None:
+            return sum(entry["count"] for entry in self._subjects.values())
+        entry = self._subjects.get(subject)
+        return entry["count"] if entry else 0
+
+    def get(self, subject: Optional[str], index: int) -> Dict:
+        """Decode the index-th question of a subject (across all subjects when None)"""
+        if subject is None:
+            for name, entry in self._subjects.items():
+                if index < entry["count"]:
+                    subject = name
+                    break
+                index -= entry["count"]
+            else:
+                raise IndexError("question index out of range")
+
+        return json.loads(self.raw(subject, index))
+
+    def raw(self, subject: str, index: int) -> bytes:
+        """Encoded JSON of the index-th question of a subject, without decoding it"""
+        offsets = self._line_offsets(subject)
+        return self._mm[offsets[index]:offsets[index + 1] - 1]
+
+    def iter_subject(self, subject: str) -> Iterator[Dict]:
+        for index in range(self.count(subject)):
+            yield self.get(subject, index)
+
+    def subject_index(self, subject: str) -> "SubjectIndex":
+        """Paging index for a subject, built the first time the subject is listed"""
+        index = self._indexes.get(subject)
+        if index is None:
+            index = self._indexes[subject] = SubjectIndex(self, subject)
+        return index
+
+    def _line_offsets(self, subject: str) -> array:
+        """Absolute start offset of each question line of a subject, plus an end sentinel"""
+        offsets = self._offsets.get(subject)
+        if offsets is not None:
+            return offsets
+
+        entry = self._subjects[subject]
+        start = self._data_start + entry["offset"]
+        end = start + entry["length"]
+        offsets = array("Q", [start])
+        pos = start
+        while pos < end:
+            newline = self._mm.find(b"\n", pos, end)
+            pos = end if newline < 0 else newline + 1
+            offsets.append(pos)
+        self._offsets[subject] = offsets
+        return offsets
+
+
+class SubjectIndex:
+    """Question ids of one subject in bank order, plus positions per indexed field value.
+
+    Banks are written sorted by id, so every position list is also sorted by
+    id and a page after a given id is found by binary search.
+    """
+
+    def __init__(self, bank: QuestionBank, subject: str):
+        self.ids = array("q")
+        self.positions: Dict[str, Dict[str, array]] = {field: {} for field in INDEXED_FIELDS}
+        for position, question in enumerate(bank.iter_subject(subject)):
+            self.ids.append(question["id"])
+            for field in INDEXED_FIELDS:
+                value = question.get(field)
+                if value is not None:
+                    self.positions[field].setdefault(value, array("I")).append(position)
+        self._combined: Dict[tuple, array] = {}
+
+    def page(self, limit: int, after_id: Optional[int] = None, filters: Optional[Dict[str, str]] = None):
+        """Positions of up to limit questions matching filters with id > after_id.
+
+        Returns (positions, total matching questions, id to pass as after_id for
+        the next page or None on the last page).
+        """
+        candidates = self._candidates(filters or {})
+        start = 0
+        if after_id is not None:
+            start = bisect.bisect_right(candidates, after_id, key=self.ids.__getitem__)
+
+        positions = candidates[start:start + limit]
+        next_after_id = None
+        if start + limit < len(candidates):
+            next_after_id = self.ids[positions[-1]]
+        return list(positions), len(candidates), next_after_id
+
+    def _candidates(self, filters: Dict[str, str]):
+        """Sorted positions matching every filter (cached per filter combination)"""
+        if not filters:
+            return range(len(self.ids))
+        matches = [self.positions[field].get(value, _NO_POSITIONS) for field, value in filters.items()]
+        if len(matches) == 1:
+            return matches[0]
+
+        key = tuple(sorted(filters.items()))
+        combined = self._combined.get(key)
+        if combined is None:
+            matches.sort(key=len)
+            others = [set(positions) for positions in matches[1:]]
+            combined = array("I", (p for p in matches[0] if all(p in other for other in others)))
+            self._combined[key] = combined
+        return combined
+
+
+_NO_POSITIONS = array("I")
+
+
+def write_question_bank(questions: Iterable[Dict], path) -> Dict[str, int]:
+    """Write questions to a bank file, grouped by subject and sorted by id"""
+    by_subject: Dict[str, List[Dict]] = {}
+    for question in questions:
+        by_subject.setdefault(question["subject"], []).append(question)
+
+    subjects = {}
+    body = []
+    offset = 0
+    for subject, items in by_subject.items():
+        items.sort(key=lambda q: q["id"])
+        lines = [
+            json.dumps(q, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+            for q in items
+        ]
+        length = sum(len(line) for line in lines)
+        subjects[subject] = {"offset": offset, "length": length, "count": len(items)}
+        body.extend(lines)
+        offset += length
+
+    manifest = {"format": BANK_FORMAT, "version": BANK_VERSION, "subjects": subjects}
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(json.dumps(manifest, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n")
+        f.writelines(body)
+    os.replace(tmp_path, path)
+    return {subject: entry["count"] for subject, entry in subjects.items()}
+
+
+def read_question_lines(path) -> List[Dict]:
+    """Read every question line of a JSON Lines file, skipping a bank manifest"""
+    questions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if item.get("format") == BANK_FORMAT:
+                continue
+            questions.append(item)
+    return questions
+
+
+_bank: Optional[QuestionBank] = None
+_bank_checked_at = 0.0
+
+# How often (seconds) refresh_question_bank looks for a new bank file on disk
+QUESTION_BANK_CHECK_INTERVAL = float(os.environ.get("QUESTION_BANK_CHECK_INTERVAL", "5"))
+
+
+def _bank_path() -> Path:
+    return Path(os.environ.get("QUESTION_BANK_PATH", DEFAULT_BANK_PATH))
+
+
+def get_question_bank() -> QuestionBank:
+    """Get the process-wide question bank, opening it on first use"""
+    global _bank
+    if _bank is None:
+        _bank = QuestionBank(_bank_path())
+    return _bank
+
+
+def refresh_question_bank() -> QuestionBank:
+    """Get the question bank, reopening it if the file was replaced on disk.
+
+    The file is stat'ed at most once per QUESTION_BANK_CHECK_INTERVAL. Decks
+    holding the previous bank keep reading from it until they are dropped, so
+    a swap never mixes indices from two different files.
+    """
+    global _bank, _bank_checked_at
+    bank = get_question_bank()
+    now = time.monotonic()
+    if now - _bank_checked_at < QUESTION_BANK_CHECK_INTERVAL:
+        return bank
+    _bank_checked_at = now
+
+    try:
+        stat = os.stat(_bank_path())
+    except OSError:
+        return bank
+    if _file_version(stat) != bank.version:
+        _bank = QuestionBank(_bank_path())
+    return _bank
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4) or sys.argv[1] != "build":
+        print("usage: python question_bank.py build <source.jsonl> [dest.jsonl]")
+        sys.exit(2)
+    source = sys.argv[2]
+    dest = sys.argv[3] if len(sys.argv) == 4 else source
+    counts = write_question_bank(read_question_lines(source), dest)
+    print(f"Wrote {dest}: {counts}")
@@ -0,0 +1,43 @@
+"""In-process token-bucket rate limiting.
+
+Each key (a client IP, a username) has a bucket holding up to `burst` tokens
+that refills at `rate` tokens per second; a request takes one token or is
+rejected with the time until the next one. Buckets are kept for the most
+recently used `max_keys` keys only, so a flood of distinct keys cannot grow
+memory without bound (an evicted key simply starts again with a full bucket).
+"""
+import time
+from collections import OrderedDict
+from typing import Hashable, Tuple
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets"""
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+        self.rejected = 0
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def acquire(self, key: Hashable) -> float:
+        """Take a token for key: 0 if allowed, else seconds until one is available"""
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / self.rate if self.rate > 0 else float("inf")
+            self.rejected += 1
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
@@ -0,0 +1,115 @@
+"""Per-room actors: every command for a room runs on that room's own task.
+
+A room's commands (joins, question draws, moves) are queued in a bounded inbox
+and executed one at a time, so a handler can await the database or a broadcast
+without another command for the same room interleaving with it. Different
+rooms have different actors and run concurrently; no global lock is involved.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RoomActor:
+    """Serializes the commands of one room through a bounded inbox"""
+
+    def __init__(self, room_code: str, inbox_size: int, idle_timeout: float,
+                 on_exit: Optional[Callable[["RoomActor"], None]] = None):
+        self.room_code = room_code
+        self.inbox: asyncio.Queue = asyncio.Queue(maxsize=inbox_size)
+        self.idle_timeout = idle_timeout
+        self.closed = False
+        self._on_exit = on_exit
+        self._task = asyncio.create_task(self._run())
+
+    async def submit(self, handler: Callable[..., Awaitable], *args):
+        """Queue handler(*args) for this room and wait for its result.
+
+        Waits for inbox space when the room is backlogged, which pushes back
+        on the sender only.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.inbox.put((handler, args, future))
+        return await future
+
+    def stop(self):
+        """Stop the actor, failing any commands still queued"""
+        self._close()
+        self._task.cancel()
+        while not self.inbox.empty():
+            _, _, future = self.inbox.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError(f"Room {self.room_code} actor stopped"))
+
+    def _close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self._on_exit:
+            self._on_exit(self)
+
+    async def _run(self):
+        while True:
+            try:
+                handler, args, future = await asyncio.wait_for(self.inbox.get(), self.idle_timeout)
+            except asyncio.TimeoutError:
+                # Idle: exit and let the next command start a fresh actor
+                if self.inbox.empty():
+                    self._close()
+                    return
+                continue
+
+            if future.cancelled():
+                # Sender went away before its turn
+                continue
+            try:
+                result = await handler(*args)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+
+class RoomActors:
+    """Registry of live room actors (room_code -> actor)"""
+
+    def __init__(self, inbox_size: int = 64, idle_timeout: float = 60.0):
+        self.inbox_size = inbox_size
+        self.idle_timeout = idle_timeout
+        self._actors: Dict[str, RoomActor] = {}
+
+    def get(self, room_code: str) -> RoomActor:
+        """Get the room's actor, starting one if it has none"""
+        actor = self._actors.get(room_code)
+        if actor is None or actor.closed:
+            actor = RoomActor(room_code, self.inbox_size, self.idle_timeout, on_exit=self._forget)
+            self._actors[room_code] = actor
+        return actor
+
+    async def submit(self, room_code: str, handler: Callable[..., Awaitable], *args):
+        """Run handler(*args) on the room's actor"""
+        return await self.get(room_code).submit(handler, *args)
+
+    def stop(self, room_code: str):
+        actor = self._actors.pop(room_code, None)
+        if actor:
+            actor.stop()
+
+    def stop_all(self):
+        for room_code in list(self._actors):
+            self.stop(room_code)
+
+    def __len__(self):
+        return len(self._actors)
+
+    def _forget(self, actor: RoomActor):
+        if self._actors.get(actor.room_code) is actor:
+            del self._actors[actor.room_code]
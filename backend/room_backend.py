@@ -0,0 +1,180 @@
+"""Pluggable room state and messaging backends.
+
+broadcast_to_room publishes through the configured backend, and each worker
+delivers published messages to the WebSocket connections it holds. A shared
+backend also stores the room state, so load_room_from_db sees changes made by
+other workers.
+
+    memory  (default) single process: messages go straight to local delivery
+            and room state lives only in this worker's rooms dict
+    redis   room state in Redis keys and messages over Redis pub/sub, so the
+            players of one room can be connected to different workers/nodes
+
+Commands for a room are serialized per worker (see room_actor.py). Across
+workers, store_room is a compare-and-set on the room's version: it only
+writes when the stored copy is still the one the command started from, and
+otherwise returns False so the caller can re-run the command on the fresh
+copy. A worker only receives the messages of rooms it subscribed to, i.e.
+rooms with players connected to it.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from wire import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+# deliver(player_ids, message, delta_message) sends to this worker's connections
+Deliver = Callable[[List[str], Dict, Optional[Dict]], Awaitable[None]]
+
+
+class InMemoryRoomBackend:
+    """Single-process backend (no shared state)"""
+
+    name = "memory"
+    shared = False
+
+    def __init__(self, deliver: Deliver):
+        self._deliver = deliver
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def subscribe(self, room_code: str):
+        pass
+
+    async def unsubscribe(self, room_code: str):
+        pass
+
+    async def fetch_room(self, room_code: str) -> Optional[Dict]:
+        return None
+
+    async def store_room(self, room_code: str, room: Dict, expected_version: Optional[int] = None) -> bool:
+        return True
+
+    async def publish(self, room_code: str, player_ids: Iterable[str], message: Dict,
+                      delta_message: Optional[Dict] = None):
+        await self._deliver(list(player_ids), message, delta_message)
+
+
+class RedisRoomBackend:
+    """Room state in Redis and cross-worker fan-out over Redis pub/sub"""
+
+    name = "redis"
+    shared = True
+
+    def __init__(self, deliver: Deliver, url: Optional[str] = None, prefix: str = "tictactoe:",
+                 state_ttl: int = 24 * 60 * 60, client=None):
+        import redis.asyncio as redis  # optional dependency, only needed for this backend
+
+        if client is None:
+            client = redis.from_url(url)
+        self._redis = client  # any redis.asyncio-compatible client (tests pass a fakeredis one)
+        self._watch_error = redis.WatchError
+        self.prefix = prefix
+        self.state_ttl = state_ttl
+        self._deliver = deliver
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._rooms: Set[str] = set()  # rooms whose channel this worker is subscribed to
+        self._subscribed = asyncio.Event()
+
+    def _state_key(self, room_code: str) -> str:
+        # A hash of {version, state}; named apart from the plain string keys older versions stored
+        return f"{self.prefix}room-state:{room_code}"
+
+    def _channel(self, room_code: str) -> str:
+        return f"{self.prefix}room:{room_code}"
+
+    async def start(self):
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener:
+            self._listener.cancel()
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        await self._redis.aclose()
+
+    async def subscribe(self, room_code: str):
+        """Receive the room's messages on this worker (idempotent)"""
+        if room_code in self._rooms:
+            return
+        self._rooms.add(room_code)
+        await self._pubsub.subscribe(self._channel(room_code))
+        self._subscribed.set()
+
+    async def unsubscribe(self, room_code: str):
+        """Stop receiving the room's messages, once no local player is in it"""
+        if room_code not in self._rooms:
+            return
+        self._rooms.discard(room_code)
+        if not self._rooms:
+            self._subscribed.clear()
+        await self._pubsub.unsubscribe(self._channel(room_code))
+
+    async def fetch_room(self, room_code: str) -> Optional[Dict]:
+        raw = await self._redis.hget(self._state_key(room_code), "state")
+        return loads(raw) if raw else None
+
+    async def store_room(self, room_code: str, room: Dict, expected_version: Optional[int] = None) -> bool:
+        """Store the room if the stored copy is still at expected_version (None: no stored copy).
+
+        Returns False, without writing, when another worker stored the room in between.
+        """
+        key = self._state_key(room_code)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                stored_version = await pipe.hget(key, "version")
+                if stored_version is not None:
+                    stored_version = int(stored_version)
+                if stored_version != expected_version:
+                    return False
+                pipe.multi()
+                pipe.hset(key, mapping={"version": room.get("version", 0), "state": dumps(room)})
+                pipe.expire(key, self.state_ttl)
+                await pipe.execute()
+            except self._watch_error:
+                return False
+        return True
+
+    async def publish(self, room_code: str, player_ids: Iterable[str], message: Dict,
+                      delta_message: Optional[Dict] = None):
+        await self._redis.publish(self._channel(room_code), dumps({
+            "player_ids": list(player_ids),
+            "message": message,
+            "delta_message": delta_message
+        }))
+
+    async def _listen(self):
+        while True:
+            try:
+                # listen() ends whenever the last room is unsubscribed
+                await self._subscribed.wait()
+                async for item in self._pubsub.listen():
+                    if item.get("type") != "message":
+                        continue
+                    envelope = loads(item["data"])
+                    await self._deliver(envelope["player_ids"], envelope["message"], envelope.get("delta_message"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Room pub/sub listener error: {e}")
+                await asyncio.sleep(1)
+
+
+def create_room_backend(kind: str, deliver: Deliver, redis_url: Optional[str] = None):
+    """Build the backend named by ROOM_BACKEND"""
+    if kind == "memory":
+        return InMemoryRoomBackend(deliver)
+    if kind == "redis":
+        if not redis_url:
+            raise ValueError("ROOM_BACKEND=redis requires REDIS_URL")
+        return RedisRoomBackend(deliver, redis_url)
+    raise ValueError(f"Unknown room backend: {kind}")
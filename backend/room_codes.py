@@ -0,0 +1,74 @@
+"""Room code allocation without rejection sampling.
+
+A code is ``prefix + encode(permute(n))`` where n comes from a per-worker
+counter and ``permute`` is a keyed Feistel network over exactly the
+36**len(body) possible bodies. The permutation is a bijection, so distinct
+counter values always give distinct codes, while consecutive codes still look
+random. Allocation is O(1) and needs no lookup in memory or in Mongo.
+
+Workers allocate concurrently without coordination by partitioning the
+counter space: worker ``w`` of ``W`` only uses n = counter * W + w. A node
+prefix (for example one letter per node) partitions the space further. That
+guarantee needs a distinct worker id per process; processes sharing an id only
+differ by where their counters start, so callers storing codes under a unique
+key should still be ready to take the next code on a duplicate.
+"""
+import hashlib
+import string
+
+ALPHABET = string.ascii_uppercase + string.digits
+CODE_LENGTH = 6
+FEISTEL_ROUNDS = 4
+
+
+class RoomCodeAllocator:
+    """Hands out unique CODE_LENGTH-character room codes"""
+
+    def __init__(self, key: bytes, prefix: str = "", worker_id: int = 0, workers: int = 1, start: int = 0):
+        prefix = prefix.upper()
+        if any(ch not in ALPHABET for ch in prefix) or len(prefix) > CODE_LENGTH - 2:
+            raise ValueError(f"Invalid room code prefix: {prefix!r}")
+        if not 0 <= worker_id < workers:
+            raise ValueError(f"worker_id must be in [0, {workers}), got {worker_id}")
+
+        self.prefix = prefix
+        self.worker_id = worker_id
+        self.workers = workers
+        self._body_length = CODE_LENGTH - len(prefix)
+        self.space = len(ALPHABET) ** self._body_length
+        # Feistel halves: n = left * _right_size + right
+        self._left_size = len(ALPHABET) ** (self._body_length // 2)
+        self._right_size = self.space // self._left_size
+        self._key = hashlib.blake2b(key, digest_size=32).digest()
+
+        self.per_worker = self.space // workers
+        self._counter = start % self.per_worker
+
+    def allocate(self) -> str:
+        """Next code for this worker (unique until the worker's counter wraps)"""
+        n = self._counter * self.workers + self.worker_id
+        self._counter = (self._counter + 1) % self.per_worker
+        return self.prefix + self._encode(self._permute(n))
+
+    def _round(self, index: int, value: int) -> int:
+        digest = hashlib.blake2b(f"{index}:{value}".encode(), key=self._key, digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    def _permute(self, n: int) -> int:
+        # Unbalanced Feistel over Z_left x Z_right: each round moves the right half
+        # to the left and adds a keyed function of it to the old left half, so
+        # the two domains swap every round and an even round count restores them.
+        left, right = divmod(n, self._right_size)
+        left_size, right_size = self._left_size, self._right_size
+        for index in range(FEISTEL_ROUNDS):
+            left, right = right, (left + self._round(index, right)) % left_size
+            left_size, right_size = right_size, left_size
+        return left * right_size + right
+
+    def _encode(self, value: int) -> str:
+        chars = []
+        for _ in range(self._body_length):
+            value, digit = divmod(value, len(ALPHABET))
+            chars.append(ALPHABET[digit])
+        return "".join(reversed(chars))
+
@@ -0,0 +1,48 @@
+"""Activity tracking for in-memory rooms, used to evict idle and finished rooms.
+
+Every touch gives a room a new deadline and pushes (deadline, room_code) onto
+a min-heap. The sweeper only pops heap entries whose deadline has passed, so
+it never scans the whole rooms dict; entries made stale by a later touch are
+discarded when they surface (lazy deletion).
+"""
+import heapq
+import time
+from typing import Dict, List, Tuple
+
+
+class RoomLifecycle:
+    """Deadlines for in-memory rooms, ordered by expiry"""
+
+    def __init__(self):
+        self._deadlines: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def touch(self, room_code: str, ttl: float):
+        """Record activity: the room becomes due for eviction ttl seconds from now"""
+        deadline = time.monotonic() + ttl
+        self._deadlines[room_code] = deadline
+        heapq.heappush(self._heap, (deadline, room_code))
+        # Rebuild from live deadlines when stale entries dominate the heap
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [(d, code) for code, d in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def forget(self, room_code: str):
+        self._deadlines.pop(room_code, None)
+
+    def is_due(self, room_code: str) -> bool:
+        deadline = self._deadlines.get(room_code)
+        return deadline is not None and deadline <= time.monotonic()
+
+    def pop_due(self) -> List[str]:
+        """Rooms whose current deadline has passed (each returned once per deadline)"""
+        now = time.monotonic()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, room_code = heapq.heappop(self._heap)
+            if self._deadlines.get(room_code) == deadline:
+                due.append(room_code)
+        return due
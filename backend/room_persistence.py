@@ -0,0 +1,132 @@
+"""Write-behind persistence for game_rooms.
+
+Room changes are recorded as pending $set fields per room and written to
+Mongo later in one unordered bulk_write, so a move does not wait for a
+database round trip and several moves to the same room collapse into a
+single update. Writes that carry a room "version" only apply while the
+stored version is not newer, so a worker writing back a stale copy of a room
+(e.g. after another worker took it over) cannot roll it back. A room whose
+document is gone (the game_rooms TTL index expires rooms by created_at, also
+ones still being played) is re-created from the pending fields when they hold
+the whole room, and logged otherwise. Durability modes:
+
+    sync         write every change immediately (the caller awaits it)
+    async        flush pending changes every `interval` seconds and at game end
+    end_of_game  keep changes in memory until the game ends (or the room is
+                 flushed explicitly, e.g. before eviction or at shutdown)
+"""
+import asyncio
+import copy
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+PERSISTENCE_MODES = ("sync", "async", "end_of_game")
+# Pending fields that are enough to re-create an expired room document (with room_code and created_at)
+ROOM_DOCUMENT_FIELDS = ("players", "player_symbols", "board")
+
+
+def _room_filter(room_code: str, fields: Dict) -> Dict:
+    """Match the room document, and with a version in fields only if it is not newer"""
+    if "version" not in fields:
+        return {"_id": room_code}
+    return {"_id": room_code, "$or": [{"version": {"$lte": fields["version"]}}, {"version": {"$exists": False}}]}
+
+
+class RoomWriteBehind:
+    """Coalesces updates to game_rooms documents and flushes them in bulk"""
+
+    def __init__(self, collection, mode: str = "async", interval: float = 1.0):
+        if mode not in PERSISTENCE_MODES:
+            raise ValueError(f"Unknown room persistence mode: {mode} (expected one of {PERSISTENCE_MODES})")
+        self.collection = collection
+        self.mode = mode
+        self.interval = interval
+        self._dirty: Dict[str, Dict] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of rooms with changes not yet written"""
+        return len(self._dirty)
+
+    def is_pending(self, room_code: str) -> bool:
+        """Whether the room has changes not yet written"""
+        return room_code in self._dirty
+
+    async def update(self, room_code: str, fields: Dict, final: bool = False):
+        """Record $set fields for a room; final=True writes them right away (game end, eviction)"""
+        if self.mode == "sync":
+            result = await self.collection.update_one(_room_filter(room_code, fields), {"$set": fields})
+            if result.matched_count == 0:
+                await self._write_unmatched({room_code: fields})
+            return
+
+        self._dirty.setdefault(room_code, {}).update(fields)
+        if final:
+            await self.flush([room_code])
+
+    async def flush(self, room_codes: Optional[Iterable[str]] = None):
+        """Write pending changes (for the given rooms, or all) in one bulk_write"""
+        if room_codes is None:
+            batch, self._dirty = self._dirty, {}
+        else:
+            batch = {code: self._dirty.pop(code) for code in room_codes if code in self._dirty}
+        if not batch:
+            return
+
+        # Snapshot now: the room dicts keep changing while the write is in flight
+        batch = {code: copy.deepcopy(fields) for code, fields in batch.items()}
+        operations = [UpdateOne(_room_filter(code, fields), {"$set": fields}) for code, fields in batch.items()]
+        try:
+            result = await self.collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.error(f"Room flush failed for {len(batch)} rooms: {e}")
+            # Put the changes back, keeping anything newer recorded meanwhile
+            for code, fields in batch.items():
+                self._dirty[code] = {**fields, **self._dirty.get(code, {})}
+            return
+        if result.matched_count < len(operations):
+            await self._write_unmatched(batch)
+
+    async def _write_unmatched(self, batch: Dict[str, Dict]):
+        """Handle updates that matched no document: re-create rooms whose document
+        expired, and leave rooms whose stored version is newer alone"""
+        try:
+            existing = {doc["_id"] async for doc in self.collection.find({"_id": {"$in": list(batch)}}, {"_id": 1})}
+            for code, fields in batch.items():
+                if code in existing:
+                    continue
+                if not all(field in fields for field in ROOM_DOCUMENT_FIELDS):
+                    logger.warning(f"Room {code} is no longer in game_rooms; update of {sorted(fields)} dropped")
+                    continue
+                await self.collection.update_one({"_id": code}, {
+                    "$set": fields,
+                    "$setOnInsert": {"room_code": code, "created_at": datetime.utcnow()}
+                }, upsert=True)
+                logger.warning(f"Room {code} had expired from game_rooms; document re-created")
+        except Exception as e:
+            logger.error(f"Re-creating expired rooms failed for {len(batch)} rooms: {e}")
+
+    def start(self):
+        if self.mode == "async" and self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stop the periodic flusher and write everything still pending"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Room flush loop error: {e}")
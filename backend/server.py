@@ -1,24 +1,44 @@
-from fastapi import FastAPI, APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Depends, Header, Query, Request
+from fastapi.responses import JSONResponse, RedirectResponse, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.datastructures import URL
+from starlette.requests import HTTPConnection
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import uuid
 import json
+import hashlib
+import secrets
+import math
 import random
-import string
+import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
+from contextvars import ContextVar
 import asyncio
 import jwt
 from passlib.context import CryptContext
-from questions import get_random_question
+from questions import QuestionDeck
+from question_bank import refresh_question_bank
+from room_actor import RoomActors
+from room_persistence import RoomWriteBehind
+from room_lifecycle import RoomLifecycle
+from room_codes import RoomCodeAllocator
+from room_backend import create_room_backend
+from cluster import RoomRouter
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+from leaderboard import Leaderboard
+from passwords import PasswordHasher, PasswordHasherBusy, build_password_context, default_workers
+from ratelimit import TokenBucketLimiter
+from cache import TTLCache
+from wire import JSON, DefaultResponse, negotiate_encoding, encode_message, decode_message
 
 # Rankings model
 class PlayerRanking(BaseModel):
@@ -31,22 +51,17 @@ class PlayerRanking(BaseModel):
     last_played: Optional[datetime] = None
 
 
-def json_serializable(obj):
-    """Make objects JSON serializable"""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    elif isinstance(obj, dict):
-        return {k: json_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [json_serializable(item) for item in obj]
+async def send_encoded(websocket: WebSocket, encoded):
+    """Send an already encoded message (text or binary frame)"""
+    if isinstance(encoded, bytes):
+        await websocket.send_bytes(encoded)
     else:
-        return obj
+        await websocket.send_text(encoded)
 
 async def safe_send_json(websocket: WebSocket, data: dict):
-    """Safely send JSON data through WebSocket"""
+    """Safely send a message through WebSocket in the connection's negotiated encoding"""
     try:
-        serializable_data = json_serializable(data)
-        await websocket.send_text(json.dumps(serializable_data))
+        await send_encoded(websocket, encode_message(data, getattr(websocket.state, "encoding", JSON)))
     except Exception as e:
         logger.error(f"Error sending WebSocket message: {e}")
         raise
@@ -64,17 +79,111 @@ db = client[os.environ['DB_NAME']]
 users_collection = db['users']
 rankings_collection = db['rankings']
 
+# game_rooms writes go through the write-behind layer (ROOM_PERSISTENCE_MODE: sync, async, end_of_game)
+room_writer = RoomWriteBehind(
+    db['game_rooms'],
+    mode=os.environ.get('ROOM_PERSISTENCE_MODE', 'async'),
+    interval=float(os.environ.get('ROOM_FLUSH_INTERVAL', '1'))  # seconds
+)
+
+# In-process leaderboard backing /api/rankings (see leaderboard.py)
+leaderboard = Leaderboard()
+leaderboard_task: Optional[asyncio.Task] = None
+leaderboard_lock = asyncio.Lock()
+leaderboard_retry_at = 0.0  # monotonic time before which requests don't retry a failed load
+LEADERBOARD_SIZE = int(os.environ.get('LEADERBOARD_SIZE', '20'))  # default page size (top N)
+LEADERBOARD_MAX_LIMIT = int(os.environ.get('LEADERBOARD_MAX_LIMIT', '100'))
+LEADERBOARD_RECONCILE_INTERVAL = float(os.environ.get('LEADERBOARD_RECONCILE_INTERVAL', '300'))  # seconds
+LEADERBOARD_RECONCILE_PAGE_SIZE = int(os.environ.get('LEADERBOARD_RECONCILE_PAGE_SIZE', '1000'))  # rankings per read
+LEADERBOARD_RETRY_INTERVAL = float(os.environ.get('LEADERBOARD_RETRY_INTERVAL', '30'))  # seconds between on-demand loads after a failure
+
+# Indexes ensured at startup: (collection, keys, options)
+GAME_ROOM_TTL_SECONDS = int(os.environ.get('GAME_ROOM_TTL_SECONDS', str(24 * 60 * 60)))
+REQUIRED_INDEXES = [
+    ("users", [("username", 1)], {"name": "username_unique", "unique": True}),
+    ("users", [("id", 1)], {"name": "id_unique", "unique": True}),
+    ("rankings", [("player_id", 1)], {"name": "player_id_unique", "unique": True}),
+    ("rankings", [("points", -1)], {"name": "points_desc"}),
+    ("refresh_tokens", [("expires_at", 1)], {"name": "expires_at_ttl", "expireAfterSeconds": 0}),
+    ("refresh_tokens", [("family_id", 1)], {"name": "family_id"}),
+    ("refresh_tokens", [("user_id", 1)], {"name": "user_id"}),
+    ("game_rooms", [("created_at", 1)], {"name": "created_at_ttl", "expireAfterSeconds": GAME_ROOM_TTL_SECONDS}),
+]
+# Result of the last ensure_indexes run (served by /api/diagnostics/indexes)
+index_report: Dict[str, List[str]] = {"created": [], "existing": [], "updated": [], "failed": []}
+
 # Authentication configuration
 SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'your-secret-key-change-in-production')
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# Refresh tokens renew access tokens without a password check. Each use rotates
+# the token; presenting an already rotated token revokes its whole session.
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.environ.get('REFRESH_TOKEN_EXPIRE_DAYS', '30'))
+REFRESH_REUSE_GRACE_SECONDS = float(os.environ.get('REFRESH_REUSE_GRACE_SECONDS', '10'))  # concurrent renewals from two tabs get 409
+# How long a rotated refresh token is kept for reuse detection (a copy presented later only gets 401)
+REFRESH_REUSE_DETECTION_HOURS = float(os.environ.get('REFRESH_REUSE_DETECTION_HOURS', '24'))
+# How get_current_user resolves a token:
+#   db         decode the JWT and load the user from Mongo on every request
+#   cached     (default) keep decoded users per token in auth_cache for AUTH_CACHE_TTL
+#   stateless  trust the signed claims (sub + username) and never query Mongo
+AUTH_MODE = os.environ.get('AUTH_MODE', 'cached')
+if AUTH_MODE not in ("db", "cached", "stateless"):
+    raise ValueError(f"Unknown AUTH_MODE: {AUTH_MODE} (expected db, cached or stateless)")
+auth_cache = TTLCache(
+    maxsize=int(os.environ.get('AUTH_CACHE_SIZE', '10000')),
+    ttl=float(os.environ.get('AUTH_CACHE_TTL', '60'))  # seconds; also capped by the token's exp
+)
+# Username lookups for login/register: users found (User) and usernames known not
+# to exist (False, kept only USERNAME_NEGATIVE_TTL so users registered on other
+# workers show up soon) are answered without querying Mongo
+user_lookup_cache = TTLCache(
+    maxsize=int(os.environ.get('USERNAME_CACHE_SIZE', '10000')),
+    ttl=float(os.environ.get('USERNAME_CACHE_TTL', '60'))  # seconds
+)
+USERNAME_NEGATIVE_TTL = float(os.environ.get('USERNAME_NEGATIVE_TTL', '5'))  # seconds
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing, run in a bounded pool off the event loop (see passwords.py).
+# The hash policy is fitted to this machine at startup: new hashes use
+# PASSWORD_HASH_SCHEME at the highest cost within PASSWORD_HASH_TARGET_MS (but
+# never below bcrypt's default of 12 rounds), and weaker stored hashes are
+# rehashed on the next login. Stronger ones are kept.
+PASSWORD_HASH_SCHEME = os.environ.get('PASSWORD_HASH_SCHEME', 'bcrypt')  # bcrypt or argon2 (needs argon2-cffi)
+PASSWORD_HASH_TARGET_MS = float(os.environ.get('PASSWORD_HASH_TARGET_MS', '250'))
+PASSWORD_HASH_ROUNDS = os.environ.get('PASSWORD_HASH_ROUNDS')  # fixed bcrypt rounds / argon2 time cost (floored the same way); skips the benchmark
+PASSWORD_ARGON2_MEMORY_KIB = int(os.environ.get('PASSWORD_ARGON2_MEMORY_KIB', '65536'))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")  # until configure_password_hashing runs
+password_hasher = PasswordHasher(
+    pwd_context,
+    workers=int(os.environ.get('PASSWORD_HASH_WORKERS', default_workers())),
+    kind=os.environ.get('PASSWORD_HASH_POOL', 'thread'),  # thread or process
+    # Hashes allowed in flight (running + queued) before requests get 429; 0 disables
+    max_pending=int(os.environ.get('PASSWORD_HASH_MAX_PENDING', '32'))
+)
+# Auth attempt budgets (token buckets, see ratelimit.py): RATE tokens/second, up to BURST at once.
+# A whole school can share one NAT address, so the per-IP budget fits several classes
+# logging in together; guessing one account's password is held back per username
+# (and by the hash pool's max_pending), not per IP
+auth_ip_limiter = TokenBucketLimiter(
+    rate=float(os.environ.get('AUTH_RATE_PER_IP', '2')),
+    burst=float(os.environ.get('AUTH_BURST_PER_IP', '300'))
+)
+auth_user_limiter = TokenBucketLimiter(
+    rate=float(os.environ.get('AUTH_RATE_PER_USERNAME', '0.1')),
+    burst=float(os.environ.get('AUTH_BURST_PER_USERNAME', '10'))
+)
+# Refreshes do no password hashing and clients make them on every page load, so
+# they have their own, larger per-IP budget instead of sharing the login IP bucket
+auth_refresh_limiter = TokenBucketLimiter(
+    rate=float(os.environ.get('AUTH_REFRESH_RATE_PER_IP', '1')),
+    burst=float(os.environ.get('AUTH_REFRESH_BURST_PER_IP', '60'))
+)
+# Take the client IP from X-Forwarded-For (set this only behind a proxy that overwrites it)
+AUTH_TRUST_FORWARDED_FOR = os.environ.get('AUTH_TRUST_FORWARDED_FOR', 'false').lower() == 'true'
+TOO_MANY_ATTEMPTS = "Muitas tentativas. Tente novamente em instantes."
 security = HTTPBearer()
 
-# Create the main app without a prefix
-app = FastAPI()
+# Create the main app without a prefix (responses are encoded by the wire serializer)
+app = FastAPI(default_response_class=DefaultResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -82,10 +191,30 @@ api_router = APIRouter(prefix="/api")
 # In-memory storage for game rooms and connections
 rooms: Dict[str, Dict] = {}
 connections: Dict[str, WebSocket] = {}
+# Reverse index of in-memory rooms: player_id -> room_code
+player_rooms: Dict[str, str] = {}
+# Question decks per room (room_code -> subject -> deck), kept outside the room
+# dict because rooms are sent to clients and persisted as plain JSON
+room_decks: Dict[str, Dict[str, QuestionDeck]] = {}
+# One actor per active room runs that room's commands in order (see room_actor.py)
+room_actors = RoomActors(
+    inbox_size=int(os.environ.get('ROOM_ACTOR_INBOX_SIZE', '64')),
+    idle_timeout=float(os.environ.get('ROOM_ACTOR_IDLE_TIMEOUT', '60'))  # seconds
+)
+# Eviction of rooms from memory by last activity (see room_lifecycle.py); evicted
+# rooms are persisted first and load_room_from_db rehydrates them on demand
+room_lifecycle = RoomLifecycle()
+room_sweeper_task: Optional[asyncio.Task] = None
+ROOM_IDLE_TTL = float(os.environ.get('ROOM_IDLE_TTL', '3600'))  # seconds, game in progress
+ROOM_ABANDONED_TTL = float(os.environ.get('ROOM_ABANDONED_TTL', '600'))  # seconds, nobody connected
+ROOM_FINISHED_TTL = float(os.environ.get('ROOM_FINISHED_TTL', '300'))  # seconds, won or draw
+ROOM_SWEEP_INTERVAL = float(os.environ.get('ROOM_SWEEP_INTERVAL', '30'))  # seconds
 
 # WebSocket keepalive configuration (optional)
 WS_SERVER_PING = os.environ.get('WS_SERVER_PING', 'true').lower() == 'true'
 WS_SERVER_PING_INTERVAL = int(os.environ.get('WS_SERVER_PING_INTERVAL', '20'))  # seconds
+# Broadcast sends to one connection give up after this long so a slow client can't stall a room
+WS_SEND_TIMEOUT = float(os.environ.get('WS_SEND_TIMEOUT', '5'))  # seconds
 
 # Define Models
 
@@ -104,6 +233,15 @@ class LoginResponse(BaseModel):
     token_type: str = "bearer"
     user_id: str
     username: str
+    refresh_token: Optional[str] = None
+    expires_in: int = ACCESS_TOKEN_EXPIRE_MINUTES * 60  # seconds until access_token expires
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: str
+    all_sessions: bool = False
 
 class User(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -153,55 +291,445 @@ class GameRoom(BaseModel):
     selected_cell: Optional[int] = None
     current_player_id: Optional[str] = None
 
+# Room code allocation (see room_codes.py). Give each worker process its own
+# ROOM_CODE_WORKER_ID in [0, ROOM_CODE_WORKERS), and/or each node its own
+# ROOM_CODE_PREFIX, and their codes can never overlap. `uvicorn --workers N`
+# starts N processes with the same environment, so it cannot do that: run one
+# uvicorn per worker id instead (e.g. ROOM_CODE_WORKER_ID=$i ROOM_CODE_WORKERS=N).
+# Without distinct ids, or after a restart that allocated faster than
+# ROOM_CODE_RATE, a code can come up again while its room is still stored;
+# create_room then gets a duplicate key from Mongo and takes the next code.
+ROOM_CODE_PREFIX = os.environ.get('ROOM_CODE_PREFIX', '')
+ROOM_CODE_WORKERS = int(os.environ.get('ROOM_CODE_WORKERS', '1'))
+ROOM_CODE_WORKER_ID = os.environ.get('ROOM_CODE_WORKER_ID')
+# Sustained allocation budget per worker (codes/second) used to resume the counter after a restart
+ROOM_CODE_RATE = float(os.environ.get('ROOM_CODE_RATE', '1'))
+
+def _room_code_counter_start() -> int:
+    """Where this process's code counter starts.
+    
+    With a configured worker id the counter follows the clock, so a restarted
+    worker resumes past every code it issued before (as long as it stays within
+    ROOM_CODE_RATE). Without one, identically configured workers would share a
+    counter sequence, so each starts at a random point instead.
+    """
+    if ROOM_CODE_WORKER_ID is not None:
+        return int(time.time() * ROOM_CODE_RATE)
+    return random.randrange(36 ** 6)
+
+# Codes create_room tries before giving up when each one is already in game_rooms
+ROOM_CODE_ATTEMPTS = int(os.environ.get('ROOM_CODE_ATTEMPTS', '20'))
+
+room_code_allocator = RoomCodeAllocator(
+    key=os.environ.get('ROOM_CODE_KEY', SECRET_KEY).encode(),
+    prefix=ROOM_CODE_PREFIX,
+    worker_id=int(ROOM_CODE_WORKER_ID or 0),
+    workers=ROOM_CODE_WORKERS,
+    start=_room_code_counter_start()
+)
+
+# Sticky room routing (see cluster.py): with CLUSTER_WORKERS (comma-separated
+# base URLs) or CLUSTER_WORKERS_FILE set, each room lives on the one worker its
+# code hashes to, and CLUSTER_SELF_URL is this worker's entry in that list.
+room_router = RoomRouter(
+    self_url=os.environ.get('CLUSTER_SELF_URL'),
+    workers=os.environ.get('CLUSTER_WORKERS', '').split(','),
+    workers_file=os.environ.get('CLUSTER_WORKERS_FILE'),
+    check_interval=float(os.environ.get('CLUSTER_CHECK_INTERVAL', '5'))  # seconds between workers file checks
+)
+WS_REDIRECT_CLOSE_CODE = 4307
+cluster_watch_task = None
+rooms_to_hand_off = set()
+
 def generate_room_code() -> str:
-    """Generate a unique 6-character room code"""
-    while True:
-        code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        if code not in rooms:
-            return code
+    """Generate a unique 6-character room code owned by this worker"""
+    code = room_code_allocator.allocate()
+    # Codes hashing to other workers are skipped (about N-1 of every N with N workers);
+    # a live code only comes back after the counter wraps around
+    while code in rooms or not room_router.is_local(code):
+        code = room_code_allocator.allocate()
+    return code
+
+def owner_redirect_url(room_code: str, connection: HTTPConnection) -> str:
+    """The URL of this request on the worker that owns room_code"""
+    owner = URL(room_router.owner(room_code))
+    url = connection.url
+    scheme = owner.scheme
+    if connection.scope["type"] == "websocket":
+        scheme = {"http": "ws", "https": "wss"}.get(scheme, scheme)
+        url = url.include_query_params(room=room_code)
+    return str(url.replace(scheme=scheme, netloc=owner.netloc))
+
+def redirect_to_owner(room_code: str, request: Request) -> Optional[RedirectResponse]:
+    """307 to the owning worker when room_code is not routed here (method and body are kept)"""
+    if room_router.is_local(room_code):
+        return None
+    return RedirectResponse(owner_redirect_url(room_code, request), status_code=307)
+
+async def send_room_redirect(websocket: WebSocket, room_code: str):
+    """Point a WebSocket client at the worker that owns room_code and close"""
+    await safe_send_json(websocket, {
+        "type": "redirect",
+        "room_code": room_code,
+        "url": owner_redirect_url(room_code, websocket)
+    })
+    await websocket.close(code=WS_REDIRECT_CLOSE_CODE)
+
+def bump_room_version(room: Dict) -> int:
+    """Advance the room's state version after a change to its players or board"""
+    room["version"] = room.get("version", 0) + 1
+    return room["version"]
+
+def get_room_deck(room_code: str, subject: str) -> QuestionDeck:
+    """Get (or create) the room's question deck for a subject"""
+    decks = room_decks.setdefault(room_code, {})
+    deck = decks.get(subject)
+    if deck is None:
+        deck = decks[subject] = QuestionDeck(subject)
+    return deck
+
+def room_ttl(room: Dict) -> float:
+    """How long a room may stay in memory without activity, given its state"""
+    if room["board"]["game_status"] in ("won", "draw"):
+        return ROOM_FINISHED_TTL
+    if not any(pid in connections for pid in room["players"]):
+        return ROOM_ABANDONED_TTL
+    return ROOM_IDLE_TTL
+
+def index_room_players(room_code: str, room: Dict):
+    """Point every player of a room at it in player_rooms"""
+    for pid in room["players"]:
+        player_rooms[pid] = room_code
 
-async def broadcast_to_room(room_code: str, message: Dict):
-    """Send a message to all players in a room"""
-    if room_code not in rooms:
+def unindex_room_players(room_code: str, room: Dict):
+    """Drop a room's players from player_rooms (unless they moved to another room)"""
+    for pid in room["players"]:
+        if player_rooms.get(pid) == room_code:
+            del player_rooms[pid]
+
+def touch_room(room_code: str):
+    """Record activity in a room, pushing back its eviction"""
+    room = rooms.get(room_code)
+    if room is not None:
+        room_lifecycle.touch(room_code, room_ttl(room))
+
+async def unload_room(room_code: str, room: Dict) -> bool:
+    """Write a room to Mongo and drop it from memory; False (room kept) if the write failed"""
+    await room_writer.update(room_code, {
+        "players": room["players"],
+        "player_symbols": room["player_symbols"],
+        "board": room["board"],
+        "current_question": room.get("current_question"),
+        "selected_cell": room.get("selected_cell"),
+        "current_player_id": room.get("current_player_id"),
+        "version": room.get("version", 0)
+    }, final=True)
+    if room_writer.is_pending(room_code):
+        return False
+    
+    del rooms[room_code]
+    unindex_room_players(room_code, room)
+    room_decks.pop(room_code, None)
+    room_lifecycle.forget(room_code)
+    await room_backend.unsubscribe(room_code)
+    return True
+
+async def evict_room(room_code: str):
+    """Persist a due room and drop it from memory (runs on the room's actor)"""
+    room = rooms.get(room_code)
+    if room is None:
+        room_lifecycle.forget(room_code)
+        return
+    if not room_lifecycle.is_due(room_code):
+        # Touched while the eviction was queued
         return
     
-    room = rooms[room_code]
+    if not await unload_room(room_code, room):
+        # Flush failed; keep the room in memory and retry on a later sweep
+        touch_room(room_code)
+        return
+    logger.info(f"Room evicted {room_code} (status={room['board']['game_status']})")
+
+async def hand_off_room(room_code: str):
+    """Release a room this worker no longer owns after a ring change (runs on the room's actor)"""
+    room = rooms.get(room_code)
+    if room is None or room_router.is_local(room_code):
+        return
+    
+    if not await unload_room(room_code, room):
+        # Flush failed; retry on the next cluster check
+        rooms_to_hand_off.add(room_code)
+        return
     for player_id in room["players"]:
-        if player_id in connections:
+        websocket = connections.get(player_id)
+        if websocket is not None:
+            try:
+                await send_room_redirect(websocket, room_code)
+            except Exception as e:
+                logger.warning(f"Failed to redirect {player_id} for room {room_code}: {e}")
+    logger.info(f"Room handed off {room_code} to {room_router.owner(room_code)}")
+
+async def _cluster_watch():
+    """Follow changes to the workers file and hand off rooms that moved to another worker"""
+    while True:
+        await asyncio.sleep(room_router.check_interval)
+        try:
+            if room_router.refresh():
+                logger.info(f"Cluster workers changed: {list(room_router.ring.nodes)}")
+                # Only here do we scan all rooms: ring changes are rare
+                rooms_to_hand_off.update(code for code in rooms if not room_router.is_local(code))
+        except Exception as e:
+            logger.error(f"Cluster workers check failed: {e}")
+        
+        pending = list(rooms_to_hand_off)
+        rooms_to_hand_off.clear()
+        for room_code in pending:
             try:
-                await safe_send_json(connections[player_id], message)
+                await room_actors.submit(room_code, hand_off_room, room_code)
             except Exception as e:
-                logger.warning(f"Broadcast failed to {player_id}: {e}")
-                # Connection is dead, remove it
-                if player_id in connections:
-                    del connections[player_id]
+                logger.error(f"Failed to hand off room {room_code}: {e}")
+                rooms_to_hand_off.add(room_code)
+
+async def _room_sweeper():
+    """Evict rooms whose deadline passed, popping only due rooms off the lifecycle heap"""
+    while True:
+        await asyncio.sleep(ROOM_SWEEP_INTERVAL)
+        for room_code in room_lifecycle.pop_due():
+            try:
+                await room_actors.submit(room_code, evict_room, room_code)
+            except Exception as e:
+                logger.error(f"Failed to evict room {room_code}: {e}")
+                touch_room(room_code)
+
+async def broadcast_to_room(room_code: str, message: Dict, delta_message: Optional[Dict] = None):
+    """Send a message to all players in a room.
+    
+    Goes through the room backend, which hands it to every worker holding one
+    of the room's connections (just this one for the in-memory backend).
+    Connections that opted into delta updates get delta_message instead, when given.
+    Inside a room command on a shared backend it is sent once the room is stored.
+    """
+    await after_room_stored(publish_to_room, room_code, message, delta_message)
+
+async def publish_to_room(room_code: str, message: Dict, delta_message: Optional[Dict] = None):
+    room = rooms.get(room_code)
+    if room is None:
+        return
+    await room_backend.publish(room_code, list(room["players"]), message, delta_message)
+
+async def deliver_to_connections(player_ids: List[str], message: Dict, delta_message: Optional[Dict] = None):
+    """Send a broadcast to the players in player_ids connected to this worker.
+    
+    Each distinct (message, encoding) is encoded once and the same buffer goes to
+    every matching connection; sends run concurrently with a per-socket timeout.
+    """
+    encoded_cache = {}
+    recipients = []
+    for player_id in player_ids:
+        websocket = connections.get(player_id)
+        if websocket is None:
+            continue
+        use_delta = delta_message is not None and getattr(websocket.state, "updates", "full") == "delta"
+        encoding = getattr(websocket.state, "encoding", JSON)
+        key = (use_delta, encoding)
+        if key not in encoded_cache:
+            try:
+                encoded_cache[key] = encode_message(delta_message if use_delta else message, encoding)
+            except Exception as e:
+                logger.error(f"Error encoding broadcast {message.get('type')} as {encoding} (delta={use_delta}): {e}")
+                encoded_cache[key] = None
+        if encoded_cache[key] is None:
+            # Only the connections using this encoding miss the message
+            continue
+        recipients.append((player_id, websocket, encoded_cache[key]))
+    
+    if not recipients:
+        return
+    
+    results = await asyncio.gather(*(
+        asyncio.wait_for(send_encoded(websocket, encoded), WS_SEND_TIMEOUT)
+        for _, websocket, encoded in recipients
+    ), return_exceptions=True)
+    
+    for (player_id, websocket, _), result in zip(recipients, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"Broadcast failed to {player_id}: {result!r}")
+            # Connection is dead or too slow, remove it (unless it already reconnected)
+            if connections.get(player_id) is websocket:
+                del connections[player_id]
+            # Close it too, so a client that is still there notices and reconnects
+            # instead of sitting in a room that never updates
+            task = asyncio.create_task(close_dropped_socket(player_id, websocket))
+            closing_sockets.add(task)
+            task.add_done_callback(closing_sockets.discard)
+
+# Close tasks for dropped sockets (the event loop only keeps weak references to tasks)
+closing_sockets = set()
+
+async def release_room_channel(room_code: str):
+    """Stop receiving a room's broadcasts once none of its players is connected to this worker"""
+    room = rooms.get(room_code)
+    if room is None or not any(pid in connections for pid in room["players"]):
+        await room_backend.unsubscribe(room_code)
+
+async def close_dropped_socket(player_id: str, websocket: WebSocket):
+    """Close a socket dropped from connections, without waiting on a stuck peer"""
+    try:
+        await asyncio.wait_for(websocket.close(code=1011), WS_SEND_TIMEOUT)
+    except Exception as e:
+        logger.debug(f"Close of dropped socket for {player_id} failed: {e!r}")
+
+# Room state/messaging backend (ROOM_BACKEND: memory or redis, see room_backend.py)
+room_backend = create_room_backend(
+    os.environ.get('ROOM_BACKEND', 'memory'),
+    deliver_to_connections,
+    redis_url=os.environ.get('REDIS_URL')
+)
+
+ROOM_STORE_ATTEMPTS = int(os.environ.get('ROOM_STORE_ATTEMPTS', '5'))  # runs of a command that keeps losing the store race
+
+# Side effects (broadcasts, ranking updates) of the room command running in this
+# task, held back until its room state is stored; None outside commands
+room_command_effects: ContextVar[Optional[List]] = ContextVar("room_command_effects", default=None)
+
+async def after_room_stored(fn, *args):
+    """Run fn(*args) now, or inside a room command once the command's room state is stored"""
+    effects = room_command_effects.get()
+    if effects is None:
+        await fn(*args)
+    else:
+        effects.append((fn, args))
+
+async def refresh_room_from_backend(room_code: str) -> Optional[Dict]:
+    """Replace the local copy of a room with the shared backend's state, if it has one"""
+    if not room_backend.shared:
+        return None
+    shared_room = await room_backend.fetch_room(room_code)
+    if shared_room:
+        rooms[room_code] = shared_room
+        index_room_players(room_code, shared_room)
+        touch_room(room_code)
+    return shared_room
+
+async def run_room_command(room_code: str, handler, *args):
+    """Run a room command (on the room's actor), syncing shared room state around it.
+    
+    With a shared backend the command runs on the backend's copy of the room and
+    the result is stored with a compare-and-set on the room version; when another
+    worker stored the room in between, the command is run again on the fresh copy.
+    Its broadcasts and ranking updates only go out after the store succeeds, so a
+    losing run has no effect beyond its direct replies to the caller.
+    """
+    if not room_backend.shared:
+        return await handler(*args)
+    
+    for attempt in range(ROOM_STORE_ATTEMPTS):
+        shared_room = await refresh_room_from_backend(room_code)
+        base_version = shared_room.get("version", 0) if shared_room else None
+        effects = []
+        token = room_command_effects.set(effects)
+        try:
+            result = await handler(*args)
+        finally:
+            room_command_effects.reset(token)
+        
+        room = rooms.get(room_code)
+        unchanged = room is None or (shared_room is not None and room.get("version", 0) == base_version)
+        if unchanged or await room_backend.store_room(room_code, room, base_version):
+            for fn, fn_args in effects:
+                await fn(*fn_args)
+            return result
+        logger.info(f"Room {room_code} was changed by another worker; re-running command (attempt {attempt + 1})")
+    
+    logger.error(f"Room {room_code}: command gave up after {ROOM_STORE_ATTEMPTS} conflicting stores")
+    raise HTTPException(status_code=409, detail="Sala ocupada, tente novamente")
 
 # Add your routes to the router instead of directly to app
 
 # Authentication endpoints
+def client_ip(request: Request) -> str:
+    if AUTH_TRUST_FORWARDED_FOR:
+        forwarded_for = request.headers.get("x-forwarded-for")
+        if forwarded_for:
+            return forwarded_for.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+def check_auth_rate(request: Request, username: Optional[str] = None):
+    """Raise 429 when the client IP (or the username) is over its auth attempt budget"""
+    retry_after = auth_ip_limiter.acquire(client_ip(request))
+    if not retry_after and username:
+        retry_after = auth_user_limiter.acquire(username.lower().strip())
+    raise_if_limited(retry_after)
+
+def raise_if_limited(retry_after: float):
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail=TOO_MANY_ATTEMPTS,
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy(request: Request, exc: PasswordHasherBusy):
+    """Shed auth load when the password hash pool is saturated"""
+    return JSONResponse(status_code=429, content={"detail": TOO_MANY_ATTEMPTS}, headers={"Retry-After": "1"})
+
 @api_router.post("/auth/login", response_model=LoginResponse)
-async def login(request: LoginRequest):
+async def login(request: LoginRequest, http_request: Request):
     """Login endpoint"""
+    check_auth_rate(http_request, request.username)
     user = await authenticate_user(request.username, request.password)
     if not user:
         raise HTTPException(status_code=401, detail="Usuário ou senha incorretos")
     
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.id}, expires_delta=access_token_expires
-    )
+    return await issue_session(user.id, user.username)
+
+@api_router.post("/auth/refresh", response_model=LoginResponse)
+async def refresh_session(request: RefreshRequest, http_request: Request):
+    """Exchange a refresh token for a new access token and refresh token (no password check)"""
+    # Keyed on the client IP: every refresh token is new, so a per-token bucket never fills
+    raise_if_limited(auth_refresh_limiter.acquire(client_ip(http_request)))
+    token_hash = hash_refresh_token(request.refresh_token)
+    now = datetime.utcnow()
     
-    return LoginResponse(
-        access_token=access_token,
-        user_id=user.id,
-        username=user.username
+    # Atomically mark the token used, so it can be exchanged only once; from now on
+    # it is only kept for reuse detection, so the TTL index removes it sooner
+    stored = await db.refresh_tokens.find_one_and_update(
+        {"_id": token_hash, "used_at": None, "revoked": False, "expires_at": {"$gt": now}},
+        {"$set": {"used_at": now}, "$min": {"expires_at": now + timedelta(hours=REFRESH_REUSE_DETECTION_HOURS)}}
     )
+    if stored is None:
+        spent = await db.refresh_tokens.find_one({"_id": token_hash})
+        if spent and spent.get("used_at") and not spent.get("revoked"):
+            if now - spent["used_at"] <= timedelta(seconds=REFRESH_REUSE_GRACE_SECONDS):
+                # Another tab just renewed with this token: the session is fine, and the
+                # client should pick up the tokens that tab stored (not log out)
+                raise HTTPException(status_code=409, detail="Sessão já renovada")
+            # A rotated token came back: someone holds a copy, so end that session
+            await revoke_refresh_tokens({"family_id": spent["family_id"]})
+            logger.warning(f"Refresh token reuse for user {spent['user_id']}; session revoked")
+        raise HTTPException(status_code=401, detail="Sessão expirada. Faça login novamente.")
+    
+    return await issue_session(stored["user_id"], stored["username"], family_id=stored["family_id"])
+
+@api_router.post("/auth/logout")
+async def logout(request: LogoutRequest):
+    """Revoke the session of a refresh token (or every session of its user)"""
+    stored = await db.refresh_tokens.find_one({"_id": hash_refresh_token(request.refresh_token)})
+    if stored:
+        if request.all_sessions:
+            await revoke_refresh_tokens({"user_id": stored["user_id"]})
+        else:
+            await revoke_refresh_tokens({"family_id": stored["family_id"]})
+    return {"message": "Sessão encerrada"}
 
 @api_router.post("/auth/register", response_model=LoginResponse)
-async def register(request: RegisterRequest):
+async def register(request: RegisterRequest, http_request: Request):
     """Register new user endpoint"""
     import re
     
+    check_auth_rate(http_request)
+    
     # Validate passwords match
     if request.password != request.confirm_password:
         raise HTTPException(status_code=400, detail="As senhas não coincidem")
@@ -215,15 +743,16 @@ async def register(request: RegisterRequest):
     if not re.match(name_pattern, request.username.strip()) or len(request.username.strip()) < 2:
         raise HTTPException(status_code=400, detail="Digite apenas nomes de pessoas (letras e espaços)")
     
-    # Check if username already exists
-    existing_user = await get_user_by_username(request.username.lower())
+    # Check if username already exists (cached; the unique index has the final say)
+    username = request.username.lower().strip()
+    existing_user = await get_user_by_username(username)
     if existing_user:
         raise HTTPException(status_code=400, detail="Este nome já está em uso")
     
     # Create new user
-    hashed_password = get_password_hash(request.password)
+    hashed_password = await get_password_hash(request.password)
     user = User(
-        username=request.username.lower().strip(),
+        username=username,
         hashed_password=hashed_password
     )
     
@@ -234,24 +763,21 @@ async def register(request: RegisterRequest):
             "hashed_password": user.hashed_password,
             "created_at": user.created_at
         })
+        user_lookup_cache.set(user.username, user)
         
-        # Create access token for immediate login
-        access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={"sub": user.id}, expires_delta=access_token_expires
-        )
-        
-        return LoginResponse(
-            access_token=access_token,
-            user_id=user.id,
-            username=user.username
-        )
+        # Create tokens for immediate login
+        return await issue_session(user.id, user.username)
+    except DuplicateKeyError:
+        # Registered concurrently, or on another worker since our lookup was cached
+        user_lookup_cache.pop(username)
+        raise HTTPException(status_code=400, detail="Este nome já está em uso")
     except Exception as e:
         raise HTTPException(status_code=500, detail="Erro ao criar usuário")
 
 @api_router.post("/auth/create-test-user")
-async def create_test_user():
+async def create_test_user(http_request: Request):
     """Create a test user (remove in production)"""
+    check_auth_rate(http_request)
     username = "admin"
     password = "123456"
     
@@ -261,7 +787,7 @@ async def create_test_user():
         return {"message": "Usuário de teste já existe", "username": username}
     
     # Create new user
-    hashed_password = get_password_hash(password)
+    hashed_password = await get_password_hash(password)
     user = User(
         username=username,
         hashed_password=hashed_password
@@ -273,6 +799,7 @@ async def create_test_user():
         "hashed_password": user.hashed_password,
         "created_at": user.created_at
     })
+    user_lookup_cache.set(user.username, user)
     
     return {"message": "Usuário de teste criado", "username": username, "password": password}
 
@@ -281,23 +808,99 @@ async def create_test_user():
 async def root():
     return {"message": "Tic-Tac-Toe Historical Game API"}
 
+# Encoded /api/questions/{subject} responses: subject -> (bank version, body, etag)
+question_payload_cache: Dict[str, tuple] = {}
+
+def get_question_payload(subject: str) -> Optional[tuple]:
+    """Get the encoded question list for a subject and its ETag, building it once per bank version"""
+    bank = refresh_question_bank()
+    cached = question_payload_cache.get(subject)
+    if cached and cached[0] == bank.version:
+        return cached[1], cached[2]
+    
+    total = bank.count(subject)
+    if not total:
+        question_payload_cache.pop(subject, None)
+        return None
+    
+    # Splice the bank's already-encoded question lines instead of decoding and re-encoding them
+    body = b"".join([
+        b'{"subject":', json.dumps(subject, ensure_ascii=False).encode("utf-8"),
+        b',"questions":[', b",".join(bank.raw(subject, i) for i in range(total)),
+        b'],"total":', str(total).encode("ascii"), b"}",
+    ])
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    question_payload_cache[subject] = (bank.version, body, etag)
+    return body, etag
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+QUESTION_PAGE_DEFAULT = 50
+QUESTION_PAGE_MAX = 500
+
+def get_question_page(subject: str, limit: Optional[int], after_id: Optional[int],
+                      fields: Optional[str], period: Optional[str]) -> Optional[Dict]:
+    """Get one page of a subject's questions from the bank's paging index"""
+    bank = refresh_question_bank()
+    if not bank.count(subject):
+        return None
+    
+    filters = {"period": period} if period is not None else {}
+    positions, total, next_after_id = bank.subject_index(subject).page(
+        limit or QUESTION_PAGE_DEFAULT, after_id, filters
+    )
+    
+    questions = [bank.get(subject, position) for position in positions]
+    if fields:
+        wanted = [name.strip() for name in fields.split(",") if name.strip()]
+        questions = [{name: q[name] for name in wanted if name in q} for q in questions]
+    
+    return {
+        "subject": subject,
+        "questions": questions,
+        "total": total,
+        "next_after_id": next_after_id
+    }
+
 @api_router.get("/questions/{subject}")
-async def get_questions_by_subject(subject: str):
-    """Get questions by subject for local games"""
+async def get_questions_by_subject(
+    subject: str,
+    limit: Optional[int] = Query(None, ge=1, le=QUESTION_PAGE_MAX),
+    after_id: Optional[int] = None,
+    fields: Optional[str] = None,
+    period: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
+):
+    """Get questions by subject for local games.
+    
+    Without query parameters the whole subject is returned (cached, with ETag).
+    With limit/after_id/fields/period a page is returned instead;
+    pass next_after_id back as after_id to get the following page.
+    period also selects the topic for quimica and matematica, whose questions
+    keep it there (the bank has no separate topic field).
+    """
     try:
-        from questions import QUESTIONS
+        if any(param is not None for param in (limit, after_id, fields, period)):
+            page = get_question_page(subject, limit, after_id, fields, period)
+            if not page:
+                raise HTTPException(status_code=404, detail=f"No questions found for subject: {subject}")
+            return page
         
-        # Filter questions by subject
-        subject_questions = [q for q in QUESTIONS if q.get("subject") == subject]
+        payload = get_question_payload(subject)
         
-        if not subject_questions:
+        if not payload:
             raise HTTPException(status_code=404, detail=f"No questions found for subject: {subject}")
         
-        return {
-            "subject": subject,
-            "questions": subject_questions,
-            "total": len(subject_questions)
-        }
+        body, etag = payload
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
     except HTTPException:
         # Re-raise HTTPExceptions (like 404) without catching them
         raise
@@ -318,14 +921,16 @@ async def get_status_checks():
     return [StatusCheck(**status_check) for status_check in status_checks]
 
 @api_router.post("/rooms/create", response_model=CreateRoomResponse)
-async def create_room(request: CreateRoomRequest):
+async def create_room(request: CreateRoomRequest, http_request: Request):
     """Create a new game room"""
-    room_code = generate_room_code()
+    if not room_router.is_member:
+        # Draining: let a worker in the ring create it
+        return redirect_to_owner(str(uuid.uuid4()), http_request)
     player_id = str(uuid.uuid4())
     
     # Create new room
     room_data = {
-        "room_code": room_code,
+        "room_code": None,
         "players": {player_id: request.player_name},
         "player_symbols": {player_id: "X"},  # First player is always X
         "board": {
@@ -338,18 +943,30 @@ async def create_room(request: CreateRoomRequest):
         "created_at": datetime.utcnow(),
         "current_question": None,
         "selected_cell": None,
-        "current_player_id": player_id
+        "current_player_id": player_id,
+        "version": 0
     }
     
+    # Save to database; the unique _id catches a code that is still taken
+    # (another process with the same worker id, or a restart that reissued it)
+    for attempt in range(ROOM_CODE_ATTEMPTS):
+        room_code = room_data["room_code"] = generate_room_code()
+        try:
+            await db.game_rooms.insert_one({**room_data, "_id": room_code})
+            break
+        except DuplicateKeyError:
+            logger.warning(f"Room code {room_code} is already in game_rooms; allocating another")
+    else:
+        logger.error(f"Room creation gave up after {ROOM_CODE_ATTEMPTS} taken codes")
+        raise HTTPException(status_code=503, detail="Não foi possível criar a sala. Tente novamente.")
+    
     rooms[room_code] = room_data
+    player_rooms[player_id] = room_code
+    touch_room(room_code)
     logger.info(f"Room created {room_code} by player {player_id} ({request.player_name})")
     
-    # Save to database
-    await db.game_rooms.insert_one({
-        **room_data,
-        "_id": room_code,
-        "created_at": room_data["created_at"]
-    })
+    if room_backend.shared:
+        await room_backend.store_room(room_code, room_data, expected_version=None)
     
     return CreateRoomResponse(room_code=room_code, player_id=player_id)
 
@@ -370,18 +987,29 @@ async def load_room_from_db(room_code: str) -> Optional[Dict]:
             "created_at": db_room["created_at"],
             "current_question": db_room.get("current_question"),
             "selected_cell": db_room.get("selected_cell"),
-            "current_player_id": db_room.get("current_player_id")
+            "current_player_id": db_room.get("current_player_id"),
+            "version": db_room.get("version", 0)
         }
         rooms[room_code] = room_data
+        index_room_players(room_code, room_data)
+        touch_room(room_code)
         return room_data
     
     return None
 
 @api_router.post("/rooms/join", response_model=JoinRoomResponse)
-async def join_room(request: JoinRoomRequest):
+async def join_room(request: JoinRoomRequest, http_request: Request):
     """Join an existing game room"""
     room_code = request.room_code.upper()
-    
+    redirect = redirect_to_owner(room_code, http_request)
+    if redirect:
+        return redirect
+    response = await room_actors.submit(room_code, run_room_command, room_code, add_player_to_room, room_code, request)
+    touch_room(room_code)
+    return response
+
+async def add_player_to_room(room_code: str, request: JoinRoomRequest) -> JoinRoomResponse:
+    """Add the joining player to the room (runs on the room's actor)"""
     # Load room from memory or database
     room = await load_room_from_db(room_code)
     if not room:
@@ -395,20 +1023,20 @@ async def join_room(request: JoinRoomRequest):
     player_id = str(uuid.uuid4())
     room["players"][player_id] = request.player_name
     room["player_symbols"][player_id] = "O"  # Second player is always O
+    player_rooms[player_id] = room_code
     
     # If room is full, start the game
     if len(room["players"]) == 2:
         room["board"]["game_status"] = "playing"
+    bump_room_version(room)
     
     # Update database
-    await db.game_rooms.update_one(
-        {"_id": room_code},
-        {"$set": {
-            "players": room["players"],
-            "player_symbols": room["player_symbols"],
-            "board": room["board"]
-        }}
-    )
+    await room_writer.update(room_code, {
+        "players": room["players"],
+        "player_symbols": room["player_symbols"],
+        "board": room["board"],
+        "version": room["version"]
+    })
     logger.info(f"Player joined room {room_code}: {player_id} ({request.player_name}) - players={len(room['players'])}")
     
     return JoinRoomResponse(
@@ -418,11 +1046,15 @@ async def join_room(request: JoinRoomRequest):
     )
 
 @api_router.get("/rooms/{room_code}/status")
-async def get_room_status(room_code: str):
+async def get_room_status(room_code: str, request: Request):
     """Get current room status"""
     room_code = room_code.upper()
+    redirect = redirect_to_owner(room_code, request)
+    if redirect:
+        return redirect
     
-    # Load room from memory or database
+    # Load room from the shared backend, memory or database
+    await refresh_room_from_backend(room_code)
     room = await load_room_from_db(room_code)
     if not room:
         raise HTTPException(status_code=404, detail="Sala não encontrada")
@@ -435,9 +1067,6 @@ async def get_room_status(room_code: str):
         "board": room["board"]
     }
 
-# Include the router in the main app
-app.include_router(api_router)
-
 async def _server_keepalive(player_id: str):
     """Optional server-side keepalive pings to client"""
     try:
@@ -456,12 +1085,117 @@ async def _server_keepalive(player_id: str):
     except asyncio.CancelledError:
         pass
 
+async def handle_join_room(websocket: WebSocket, player_id: str, room_code: str, message: Dict):
+    """Player joined a room, send initial state"""
+    room = await load_room_from_db(room_code)
+    if room:
+        # Se ao conectar só existir 1 player, garanta que o current_player_id aponte para o X (criador)
+        if len(room["players"]) == 1:
+            try:
+                # encontrar jogador com símbolo X
+                x_player_id = next((pid for pid, sym in room["player_symbols"].items() if sym == "X"), None)
+                if x_player_id and room.get("current_player_id") != x_player_id:
+                    room["current_player_id"] = x_player_id
+                    bump_room_version(room)
+            except Exception as e:
+                logger.warning(f"Failed to set current_player_id on join_room: {e}")
+        # Receive the room's broadcasts on this worker while the player is connected here
+        await room_backend.subscribe(room_code)
+        await safe_send_json(websocket, {
+            "type": "room_state",
+            "room": room
+        })
+
+        # Notify other players
+        await broadcast_to_room(room_code, {
+            "type": "player_joined",
+            "player_name": room["players"].get(player_id, "Unknown"),
+            "player_count": len(room["players"]),
+            "room": room
+        })
+    else:
+        await safe_send_json(websocket, {
+            "type": "error",
+            "message": "Sala não encontrada"
+        })
+
+async def handle_make_move(websocket: WebSocket, player_id: str, room_code: str, message: Dict):
+    """Player makes a move"""
+    cell_index = message.get("cell_index")
+    selected_answer = message.get("selected_answer")
+    question = message.get("question")
+
+    room = await load_room_from_db(room_code)
+    if room:
+        # Validate it's the player's turn
+        if room["current_player_id"] != player_id:
+            await safe_send_json(websocket, {
+                "type": "error",
+                "message": "Não é sua vez!"
+            })
+            return
+
+        # Process the move
+        await process_game_move(room_code, player_id, cell_index, selected_answer, question)
+
+async def handle_get_question(websocket: WebSocket, player_id: str, room_code: str, message: Dict):
+    """Client requests a question for a cell"""
+    cell_index = message.get("cell_index")
+    subject = message.get("subject", "historia")  # Default to historia for backward compatibility
+
+    room = await load_room_from_db(room_code)
+    if room:
+        # Set current question and selected cell based on subject
+        deck_subject = subject if subject in ("quimica", "matematica") else "historia"
+        question = get_room_deck(room_code, deck_subject).draw()
+
+        room["current_question"] = question
+        room["selected_cell"] = cell_index
+        room["subject"] = subject  # Store subject in room
+        version = bump_room_version(room)
+
+        # Send question to the current player
+        await safe_send_json(websocket, {
+            "type": "question",
+            "question": question,
+            "cell_index": cell_index,
+            "subject": subject,
+            "version": version
+        })
+
+        # Notify other player that someone is answering (delta clients take the new version from it)
+        await broadcast_to_room(room_code, {
+            "type": "player_answering",
+            "player_name": room["players"][player_id],
+            "cell_index": cell_index,
+            "subject": subject,
+            "version": version
+        })
+
+# Room commands run on the room's actor, so they never interleave within a room
+ROOM_COMMANDS = {
+    "join_room": handle_join_room,
+    "make_move": handle_make_move,
+    "get_question": handle_get_question,
+}
+
 @app.websocket("/api/ws/{player_id}")
 async def websocket_endpoint(websocket: WebSocket, player_id: str):
     """WebSocket endpoint for real-time game communication"""
-    await websocket.accept()
+    encoding, subprotocol = negotiate_encoding(
+        websocket.scope.get("subprotocols"), websocket.query_params.get("encoding")
+    )
+    await websocket.accept(subprotocol=subprotocol)
+    websocket.state.encoding = encoding
+    # ?updates=delta: receive game_delta messages instead of full-room game_update
+    websocket.state.updates = "delta" if websocket.query_params.get("updates") == "delta" else "full"
+    # ?room=CODE: with sticky routing, clients naming their room are sent to its worker up front
+    requested_room = (websocket.query_params.get("room") or "").upper()
+    if requested_room and not room_router.is_local(requested_room):
+        await send_room_redirect(websocket, requested_room)
+        return
     connections[player_id] = websocket
-    logger.info(f"WS connected: player_id={player_id}")
+    logger.info(f"WS connected: player_id={player_id} encoding={encoding}")
 
     keepalive_task = None
     if WS_SERVER_PING:
@@ -472,9 +1206,11 @@ async def websocket_endpoint(websocket: WebSocket, player_id: str):
         await safe_send_json(websocket, {"type": "connected", "player_id": player_id})
         
         while True:
-            # Receive message from client
-            data = await websocket.receive_text()
-            message = json.loads(data)
+            # Receive message from client (JSON text or, if negotiated, MessagePack binary)
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            message = decode_message(frame)
             
             message_type = message.get("type")
             room_code = message.get("room_code")
@@ -485,90 +1221,41 @@ async def websocket_endpoint(websocket: WebSocket, player_id: str):
                 await safe_send_json(websocket, {"type": "pong"})
                 continue
             
-            elif message_type == "join_room":
-                # Player joined a room, send initial state
+            elif room_code and not room_router.is_local(room_code):
+                # Room lives on another worker: send the client there
+                await send_room_redirect(websocket, room_code)
+                raise WebSocketDisconnect(WS_REDIRECT_CLOSE_CODE)
+            
+            elif message_type == "sync":
+                # Delta client reports its room version; resend the full state if it is behind
                 room = await load_room_from_db(room_code)
                 if room:
-                    # Se ao conectar só existir 1 player, garanta que o current_player_id aponte para o X (criador)
-                    if len(room["players"]) == 1:
-                        try:
-                            # encontrar jogador com símbolo X
-                            x_player_id = next((pid for pid, sym in room["player_symbols"].items() if sym == "X"), None)
-                            if x_player_id:
-                                room["current_player_id"] = x_player_id
-                        except Exception as e:
-                            logger.warning(f"Failed to set current_player_id on join_room: {e}")
-                    await safe_send_json(websocket, {
-                        "type": "room_state",
-                        "room": room
-                    })
-                    
-                    # Notify other players
-                    await broadcast_to_room(room_code, {
-                        "type": "player_joined",
-                        "player_name": room["players"].get(player_id, "Unknown"),
-                        "player_count": len(room["players"]),
-                        "room": room
-                    })
+                    if message.get("version") != room.get("version", 0):
+                        await safe_send_json(websocket, {
+                            "type": "room_state",
+                            "room": room
+                        })
+                    else:
+                        await safe_send_json(websocket, {
+                            "type": "in_sync",
+                            "version": room.get("version", 0)
+                        })
                 else:
                     await safe_send_json(websocket, {
                         "type": "error",
                         "message": "Sala não encontrada"
                     })
             
-            elif message_type == "make_move":
-                # Player makes a move
-                cell_index = message.get("cell_index")
-                selected_answer = message.get("selected_answer")
-                question = message.get("question")
-                
-                room = await load_room_from_db(room_code)
-                if room:
-                    # Validate it's the player's turn
-                    if room["current_player_id"] != player_id:
-                        await safe_send_json(websocket, {
-                            "type": "error",
-                            "message": "Não é sua vez!"
-                        })
-                        continue
-                    
-                    # Process the move
-                    await process_game_move(room_code, player_id, cell_index, selected_answer, question)
-            
-            elif message_type == "get_question":
-                # Client requests a question for a cell
-                cell_index = message.get("cell_index")
-                subject = message.get("subject", "historia")  # Default to historia for backward compatibility
-                
-                room = await load_room_from_db(room_code)
-                if room:
-                    # Set current question and selected cell based on subject
-                    if subject == "quimica":
-                        question = get_random_question(subject="quimica")
-                    elif subject == "matematica":
-                        question = get_random_question(subject="matematica")
-                    else:  # default to historia
-                        question = get_random_question(subject="historia")
-                    
-                    room["current_question"] = question
-                    room["selected_cell"] = cell_index
-                    room["subject"] = subject  # Store subject in room
-                    
-                    # Send question to the current player
-                    await safe_send_json(websocket, {
-                        "type": "question",
-                        "question": question,
-                        "cell_index": cell_index,
-                        "subject": subject
-                    })
-                    
-                    # Notify other player that someone is answering
-                    await broadcast_to_room(room_code, {
-                        "type": "player_answering",
-                        "player_name": room["players"][player_id],
-                        "cell_index": cell_index,
-                        "subject": subject
-                    })
+            elif message_type in ROOM_COMMANDS:
+                handler = ROOM_COMMANDS[message_type]
+                if room_code:
+                    try:
+                        await room_actors.submit(room_code, run_room_command, room_code, handler, websocket, player_id, room_code, message)
+                    except HTTPException as e:
+                        await safe_send_json(websocket, {"type": "error", "message": e.detail})
+                    touch_room(room_code)
+                else:
+                    await handler(websocket, player_id, room_code, message)
     
     except WebSocketDisconnect:
         # Handle disconnection
@@ -577,14 +1264,18 @@ async def websocket_endpoint(websocket: WebSocket, player_id: str):
             del connections[player_id]
         
         # Find room and mark player as disconnected, but don't remove immediately
-        for room_code, room in rooms.items():
-            if player_id in room["players"]:
-                # Notify other players
-                await broadcast_to_room(room_code, {
-                    "type": "player_disconnected",
-                    "player_name": room["players"][player_id]
-                })
-                break
+        room_code = player_rooms.get(player_id)
+        room = rooms.get(room_code) if room_code else None
+        if room and player_id in room["players"]:
+            # Notify other players
+            await broadcast_to_room(room_code, {
+                "type": "player_disconnected",
+                "player_name": room["players"][player_id]
+            })
+            # May now count as abandoned, which shortens its time in memory
+            touch_room(room_code)
+        if room_code:
+            await release_room_channel(room_code)
     except Exception as e:
         logger.error(f"WS error for {player_id}: {e}")
         raise
@@ -620,17 +1311,20 @@ async def process_game_move(room_code: str, player_id: str, cell_index: int, sel
                 winner_player_id = pid
                 break
         
-        # Update rankings for both players
-        for pid, player_name in room["players"].items():
-            is_winner = (pid == winner_player_id)
-            await update_player_ranking(pid, player_name, won=is_winner)
+        # Update rankings for both players (once the room is stored, so a re-run can't count it twice)
+        await after_room_stored(update_player_rankings, [
+            (pid, player_name, pid == winner_player_id)
+            for pid, player_name in room["players"].items()
+        ])
             
     elif all(cell is not None for cell in board["board"]):
         board["game_status"] = "draw"
         
         # Update rankings for draw (both players get participation points)
-        for pid, player_name in room["players"].items():
-            await update_player_ranking(pid, player_name, won=False)
+        await after_room_stored(update_player_rankings, [
+            (pid, player_name, False)
+            for pid, player_name in room["players"].items()
+        ])
     else:
         # Switch turns
         current_symbol = room["player_symbols"][player_id]
@@ -646,25 +1340,46 @@ async def process_game_move(room_code: str, player_id: str, cell_index: int, sel
     # Clear current question
     room["current_question"] = None
     room["selected_cell"] = None
+    version = bump_room_version(room)
     
-    # Update database (persist both board and current_player_id)
-    await db.game_rooms.update_one(
-        {"_id": room_code},
-        {"$set": {"board": board, "current_player_id": room["current_player_id"]}}
+    # Update database (persist board, current_player_id and version; written
+    # right away when the game ends, otherwise coalesced by the write-behind layer)
+    await room_writer.update(
+        room_code,
+        {"board": board, "current_player_id": room["current_player_id"], "version": version},
+        final=board["game_status"] in ("won", "draw")
     )
     
-    # Broadcast updated game state
+    move = {
+        "player_id": player_id,
+        "player_name": room["players"][player_id],
+        "cell_index": cell_index,
+        "is_correct": is_correct,
+        "answer": selected_answer,
+        "correct_answer": question["correctAnswer"]
+    }
+    
+    # Broadcast updated game state: the whole room by default, or only what
+    # changed for clients in delta mode. A delta applies on top of
+    # base_version (drawing a question also advances the version, which
+    # player_answering carries); clients at any other version send "sync".
     await broadcast_to_room(room_code, {
         "type": "game_update",
         "room": room,
-        "move": {
-            "player_id": player_id,
-            "player_name": room["players"][player_id],
-            "cell_index": cell_index,
-            "is_correct": is_correct,
-            "answer": selected_answer,
-            "correct_answer": question["correctAnswer"]
-        }
+        "move": move
+    }, delta_message={
+        "type": "game_delta",
+        "room_code": room_code,
+        "version": version,
+        "base_version": version - 1,
+        "cell_index": cell_index,
+        "symbol": player_symbol,
+        "color": board["board_colors"][cell_index],
+        "current_player": board["current_player"],
+        "current_player_id": room["current_player_id"],
+        "game_status": board["game_status"],
+        "winner": board["winner"],
+        "move": move
     })
 
 def check_winner(board: List[Optional[str]], board_colors: List[Optional[str]]) -> Optional[str]:
@@ -685,54 +1400,112 @@ def check_winner(board: List[Optional[str]], board_colors: List[Optional[str]])
     return None
 
 # Ranking management functions
-async def update_player_ranking(player_id: str, username: str, won: bool = False):
-    """Update player ranking after a game"""
-    ranking = await rankings_collection.find_one({"player_id": player_id})
-    
-    if ranking:
-        # Update existing ranking
-        new_games_played = ranking["games_played"] + 1
-        new_games_won = ranking["games_won"] + (1 if won else 0)
-        new_points = ranking["points"] + (3 if won else 1)  # 3 points for win, 1 for participation
-        new_win_rate = (new_games_won / new_games_played) * 100
-        
-        await rankings_collection.update_one(
+async def update_player_rankings(results: List[tuple]):
+    """Update rankings for (player_id, username, won) results in one bulk write.
+    
+    Each update is an atomic $inc upsert, so concurrent games can't lose
+    updates. win_rate is derived from games_won/games_played when read.
+    """
+    now = datetime.utcnow()
+    operations = [
+        UpdateOne(
             {"player_id": player_id},
-            {"$set": {
-                "games_played": new_games_played,
-                "games_won": new_games_won,
-                "points": new_points,
-                "win_rate": round(new_win_rate, 1),
-                "last_played": datetime.utcnow()
-            }}
+            {
+                "$inc": {
+                    "games_played": 1,
+                    "games_won": 1 if won else 0,
+                    "points": 3 if won else 1  # 3 points for win, 1 for participation
+                },
+                "$set": {"last_played": now},
+                "$setOnInsert": {"username": username}
+            },
+            upsert=True
         )
-    else:
-        # Create new ranking entry
-        new_ranking = {
-            "player_id": player_id,
-            "username": username,
-            "points": 3 if won else 1,
-            "games_played": 1,
-            "games_won": 1 if won else 0,
-            "win_rate": 100.0 if won else 0.0,
-            "last_played": datetime.utcnow()
-        }
-        await rankings_collection.insert_one(new_ranking)
-
-async def get_rankings():
-    """Get top rankings sorted by points"""
-    cursor = rankings_collection.find().sort("points", -1).limit(20)
-    rankings = []
-    async for ranking in cursor:
-        rankings.append({
-            "id": str(ranking["_id"]),
-            "name": ranking["username"],
-            "points": ranking["points"],
-            "games": ranking["games_played"],
-            "wins": ranking["games_won"],
-            "winRate": ranking["win_rate"]
-        })
-    return rankings
+        for player_id, username, won in results
+    ]
+    if not operations:
+        return
+    result = await rankings_collection.bulk_write(operations, ordered=False)
+    
+    # Apply the same increments to the leaderboard (new players get their upserted _id)
+    upserted_ids = result.upserted_ids or {}
+    for index, (player_id, username, won) in enumerate(results):
+        ranking_id = upserted_ids.get(index)
+        leaderboard.record_result(player_id, username, won, now,
+                                  ranking_id=str(ranking_id) if ranking_id is not None else None)
+
+def win_rate(ranking: Dict) -> float:
+    """Win percentage of a ranking document"""
+    games_played = ranking.get("games_played", 0)
+    if not games_played:
+        return 0.0
+    return round(ranking.get("games_won", 0) / games_played * 100, 1)
+
+def format_ranking(entry: Dict) -> Dict:
+    """Shape a leaderboard entry for the rankings API"""
+    return {
+        "id": entry["id"],
+        "name": entry["username"],
+        "points": entry["points"],
+        "games": entry["games_played"],
+        "wins": entry["games_won"],
+        "winRate": win_rate(entry)
+    }
+
+async def reconcile_leaderboard():
+    """Merge the rankings collection into the leaderboard (picks up other workers' updates),
+    a page at a time in player_id order; one reconcile runs at a time"""
+    async with leaderboard_lock:
+        last_player_id = None
+        while True:
+            query = {"player_id": {"$gt": last_player_id}} if last_player_id is not None else {}
+            cursor = rankings_collection.find(query, {
+                "player_id": 1, "username": 1, "points": 1, "games_played": 1, "games_won": 1, "last_played": 1
+            }).sort("player_id", 1).limit(LEADERBOARD_RECONCILE_PAGE_SIZE)
+            page = await cursor.to_list(None)
+            leaderboard.merge(page)
+            if len(page) < LEADERBOARD_RECONCILE_PAGE_SIZE:
+                break
+            last_player_id = page[-1]["player_id"]
+        leaderboard.mark_loaded()
+    logger.info(f"Leaderboard reconciled: {len(leaderboard)} players")
+
+async def ensure_leaderboard_loaded():
+    """Load the leaderboard on first use when the startup load failed.
+    
+    Requests arriving while a reconcile runs wait for it instead of starting
+    their own, and after a failed load the next try waits for
+    LEADERBOARD_RETRY_INTERVAL. Meanwhile whatever is loaded is served, or
+    503 while the leaderboard is empty.
+    """
+    global leaderboard_retry_at
+    if leaderboard.loaded:
+        return
+    if leaderboard_lock.locked():
+        async with leaderboard_lock:
+            pass
+    elif time.monotonic() >= leaderboard_retry_at:
+        try:
+            await reconcile_leaderboard()
+        except Exception as e:
+            logger.error(f"Leaderboard load failed: {e}")
+            leaderboard_retry_at = time.monotonic() + LEADERBOARD_RETRY_INTERVAL
+    if not leaderboard.loaded and not len(leaderboard):
+        raise HTTPException(status_code=503, detail="Ranking indisponível no momento")
+
+async def _leaderboard_reconcile_loop():
+    """Periodically reconcile the leaderboard with Mongo"""
+    while True:
+        await asyncio.sleep(LEADERBOARD_RECONCILE_INTERVAL)
+        try:
+            await reconcile_leaderboard()
+        except Exception as e:
+            logger.error(f"Leaderboard reconcile failed: {e}")
+
+async def get_rankings(limit: int = LEADERBOARD_SIZE, offset: int = 0):
+    """Get rankings sorted by points from the in-process leaderboard"""
+    await ensure_leaderboard_loaded()
+    return [format_ranking(entry) for entry in leaderboard.top(limit, offset)]
 
 app.add_middleware(
     CORSMiddleware,
@@ -743,13 +1516,16 @@ app.add_middleware(
 )
 
 # Authentication Functions
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password against its hash (in the password hash pool).
+    
+    Also returns a new hash when the stored one is out of the current policy.
+    """
+    return await password_hasher.verify_and_update(plain_password, hashed_password)
 
-def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    """Hash a password (in the password hash pool)"""
+    return await password_hasher.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
@@ -762,48 +1538,301 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def hash_refresh_token(token: str) -> str:
+    """Refresh tokens are stored as SHA-256 digests (they are random 256-bit values, so no bcrypt)"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+async def issue_session(user_id: str, username: str, family_id: Optional[str] = None) -> LoginResponse:
+    """Create an access token and a refresh token (in family_id's session, or a new one)"""
+    access_token = create_access_token(
+        data={"sub": user_id, "username": username},
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    refresh_token = secrets.token_urlsafe(32)
+    now = datetime.utcnow()
+    await db.refresh_tokens.insert_one({
+        "_id": hash_refresh_token(refresh_token),
+        "user_id": user_id,
+        "username": username,
+        "family_id": family_id or str(uuid.uuid4()),
+        "created_at": now,
+        "expires_at": now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        "used_at": None,
+        "revoked": False
+    })
+    return LoginResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        user_id=user_id,
+        username=username
+    )
+
+async def revoke_refresh_tokens(query: Dict):
+    """Revoke matching refresh tokens; they stay stored (for reuse detection) until the TTL index expires them"""
+    await db.refresh_tokens.update_many(query, {"$set": {"revoked": True}})
+
 async def get_user_by_username(username: str) -> Optional[User]:
-    """Get user from database by username"""
-    user_data = await db.users.find_one({"username": username.lower()})
+    """Get user by username, from user_lookup_cache or the database"""
+    username = username.lower()
+    cached = user_lookup_cache.get(username)
+    if cached is not None:
+        return cached or None
+    
+    user_data = await db.users.find_one({"username": username})
     if user_data:
-        return User(**user_data)
+        user = User(**user_data)
+        user_lookup_cache.set(username, user)
+        return user
+    user_lookup_cache.set(username, False, ttl=USERNAME_NEGATIVE_TTL)
     return None
 
 async def authenticate_user(username: str, password: str) -> Optional[User]:
     """Authenticate user with username and password"""
     user = await get_user_by_username(username.lower())
-    if not user or not verify_password(password, user.hashed_password):
+    if not user:
         return None
+    verified, new_hash = await verify_password(password, user.hashed_password)
+    if not verified:
+        return None
+    if new_hash:
+        # Rehash to the current policy while we have the plain password
+        try:
+            await db.users.update_one({"id": user.id}, {"$set": {"hashed_password": new_hash}})
+            invalidate_cached_user(user.id)
+            logger.info(f"Password rehashed for user {user.id}")
+        except Exception as e:
+            logger.warning(f"Password rehash failed for user {user.id}: {e}")
     return user
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
-    """Get current user from JWT token"""
+    """Get current user from JWT token (see AUTH_MODE)"""
+    token = credentials.credentials
+    if AUTH_MODE != "db":
+        cached_user = auth_cache.get(token)
+        if cached_user is not None:
+            return cached_user
+    
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Token inválido")
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Token inválido")
     
-    user_data = await db.users.find_one({"id": user_id})
-    if user_data is None:
-        raise HTTPException(status_code=401, detail="Usuário não encontrado")
-    return User(**user_data)
+    if AUTH_MODE == "stateless" and payload.get("username"):
+        # The signature vouches for the claims; the password hash is never needed here
+        user = User(id=user_id, username=payload["username"], hashed_password="")
+    else:
+        user_data = await db.users.find_one({"id": user_id})
+        if user_data is None:
+            raise HTTPException(status_code=401, detail="Usuário não encontrado")
+        user = User(**user_data)
+    
+    if AUTH_MODE != "db":
+        # Never outlive the token itself
+        auth_cache.set(token, user, ttl=payload.get("exp", 0) - time.time())
+    return user
+
+def invalidate_cached_user(user_id: str):
+    """Drop cached tokens and lookups of a user whose record changed"""
+    auth_cache.discard_where(lambda user: user.id == user_id)
+    user_lookup_cache.discard_where(lambda user: user and user.id == user_id)
+
+async def ensure_indexes() -> Dict[str, List[str]]:
+    """Create any missing REQUIRED_INDEXES; safe to run on every startup.
+    
+    An index with the right keys but other options does not count as present:
+    a different TTL is changed in place with collMod, while a missing or extra
+    unique constraint is reported as failed (fixing it means dropping the index,
+    and making it unique can fail on duplicates, so that is left to an operator).
+    """
+    report = {"created": [], "existing": [], "updated": [], "failed": []}
+    for collection_name, keys, options in REQUIRED_INDEXES:
+        label = f"{collection_name}.{options['name']}"
+        collection = db[collection_name]
+        try:
+            existing = await collection.index_information()
+            info = next((info for info in existing.values() if info.get("key") == keys), None)
+            if info is None:
+                await collection.create_index(keys, **options)
+                report["created"].append(label)
+                continue
+            
+            if bool(info.get("unique", False)) != bool(options.get("unique", False)):
+                logger.error(f"Index {label} exists with unique={bool(info.get('unique', False))}, "
+                             f"expected unique={bool(options.get('unique', False))}; drop it to recreate")
+                report["failed"].append(label)
+            elif info.get("expireAfterSeconds") != options.get("expireAfterSeconds"):
+                if "expireAfterSeconds" not in options or "expireAfterSeconds" not in info:
+                    logger.error(f"Index {label} TTL is {info.get('expireAfterSeconds')}, "
+                                 f"expected {options.get('expireAfterSeconds')}; drop it to recreate")
+                    report["failed"].append(label)
+                    continue
+                await db.command({
+                    "collMod": collection_name,
+                    "index": {"keyPattern": dict(keys), "expireAfterSeconds": options["expireAfterSeconds"]}
+                })
+                logger.info(f"Index {label} TTL changed {info['expireAfterSeconds']} -> {options['expireAfterSeconds']}")
+                report["updated"].append(label)
+            else:
+                report["existing"].append(label)
+        except Exception as e:
+            logger.error(f"Failed to ensure index {label}: {e}")
+            report["failed"].append(label)
+    
+    logger.info(f"Indexes created={report['created']} existing={report['existing']} "
+                f"updated={report['updated']} failed={report['failed']}")
+    index_report.update(report)
+    return report
+
+def _plan_summary(plan: Dict) -> Dict:
+    """Collect stage names and index names from an explain() winning plan"""
+    stages, indexes = [], []
+    pending = [plan]
+    while pending:
+        node = pending.pop()
+        if "stage" in node:
+            stages.append(node["stage"])
+        if "indexName" in node:
+            indexes.append(node["indexName"])
+        pending.extend(node.get("inputStages", []))
+        if "inputStage" in node:
+            pending.append(node["inputStage"])
+    return {"stages": stages, "indexes": indexes, "uses_index": bool(indexes)}
+
+@api_router.get("/diagnostics/indexes")
+async def get_index_diagnostics(current_user: User = Depends(get_current_user)):
+    """Report the startup index bootstrap and the indexes currently present"""
+    present = {}
+    for collection_name in sorted({name for name, _, _ in REQUIRED_INDEXES}):
+        present[collection_name] = sorted((await db[collection_name].index_information()).keys())
+    return {"bootstrap": index_report, "present": present}
+
+@api_router.get("/diagnostics/password-hashing")
+async def get_password_hashing_diagnostics(current_user: User = Depends(get_current_user)):
+    """Password hash pool size, queue depth and throughput"""
+    return password_hasher.stats()
+
+@api_router.get("/diagnostics/explain")
+async def get_query_diagnostics(current_user: User = Depends(get_current_user)):
+    """Explain the server's hot queries to confirm they are served by indexes"""
+    queries = {
+        "users_by_username": db.users.find({"username": current_user.username}),
+        "users_by_id": db.users.find({"id": current_user.id}),
+        "rankings_by_player_id": db.rankings.find({"player_id": current_user.id}),
+        "rankings_top_points": db.rankings.find().sort("points", -1).limit(LEADERBOARD_SIZE),
+    }
+    results = {}
+    for name, cursor in queries.items():
+        try:
+            explanation = await cursor.explain()
+            results[name] = _plan_summary(explanation["queryPlanner"]["winningPlan"])
+        except Exception as e:
+            results[name] = {"error": str(e)}
+    return {"queries": results}
+
 @api_router.get("/rankings")
-async def get_global_rankings():
-    """Get global rankings"""
+async def get_global_rankings(
+    limit: int = Query(LEADERBOARD_SIZE, ge=1, le=LEADERBOARD_MAX_LIMIT),
+    offset: int = Query(0, ge=0)
+):
+    """Get global rankings (served from the in-process leaderboard)"""
     try:
-        rankings = await get_rankings()
-        return {"rankings": rankings}
+        rankings = await get_rankings(limit, offset)
+        return {"rankings": rankings, "offset": offset, "total": len(leaderboard)}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting rankings: {e}")
         raise HTTPException(status_code=500, detail="Error getting rankings")
 
+@api_router.get("/rankings/{player_id}")
+async def get_player_rank(player_id: str):
+    """Get a player's own position in the global rankings"""
+    await ensure_leaderboard_loaded()
+    found = leaderboard.rank(player_id)
+    if not found:
+        raise HTTPException(status_code=404, detail="Jogador sem ranking")
+    rank, entry = found
+    return {"rank": rank, "ranking": format_ranking(entry), "total": len(leaderboard)}
+
+@api_router.get("/players/{player_id}/room")
+async def get_player_room(player_id: str):
+    """Find the room a player is in"""
+    room_code = player_rooms.get(player_id)
+    room = rooms.get(room_code) if room_code else None
+    if not room:
+        raise HTTPException(status_code=404, detail="Jogador não está em nenhuma sala")
+    
+    return {
+        "player_id": player_id,
+        "room_code": room_code,
+        "player_count": len(room["players"]),
+        "game_status": room["board"]["game_status"]
+    }
+
+# Include the router in the main app (after every route above has been registered)
+app.include_router(api_router)
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def start_room_backend():
+    await room_backend.start()
+    logger.info(f"Room backend: {room_backend.name}")
+
+@app.on_event("startup")
+async def configure_password_hashing():
+    rounds = int(PASSWORD_HASH_ROUNDS) if PASSWORD_HASH_ROUNDS else None
+    context, policy = await asyncio.to_thread(
+        build_password_context, PASSWORD_HASH_SCHEME, PASSWORD_HASH_TARGET_MS, rounds, PASSWORD_ARGON2_MEMORY_KIB
+    )
+    password_hasher.set_context(context, policy)
+    logger.info(f"Password hashing: {policy}")
+
+@app.on_event("startup")
+async def bootstrap_indexes():
+    await ensure_indexes()
+
+@app.on_event("startup")
+async def start_room_writer():
+    room_writer.start()
+
+@app.on_event("startup")
+async def start_room_sweeper():
+    global room_sweeper_task
+    room_sweeper_task = asyncio.create_task(_room_sweeper())
+
+@app.on_event("startup")
+async def start_cluster_watch():
+    global cluster_watch_task
+    if room_router.enabled:
+        logger.info(f"Sticky room routing: {room_router.self_url} in {list(room_router.ring.nodes)}")
+    if room_router.workers_file:
+        cluster_watch_task = asyncio.create_task(_cluster_watch())
+
+@app.on_event("startup")
+async def start_leaderboard():
+    global leaderboard_task
+    try:
+        await reconcile_leaderboard()
+    except Exception as e:
+        logger.error(f"Initial leaderboard load failed: {e}")
+    leaderboard_task = asyncio.create_task(_leaderboard_reconcile_loop())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if leaderboard_task:
+        leaderboard_task.cancel()
+    if room_sweeper_task:
+        room_sweeper_task.cancel()
+    if cluster_watch_task:
+        cluster_watch_task.cancel()
+    room_actors.stop_all()
+    await room_writer.stop()
+    await room_backend.stop()
+    password_hasher.shutdown()
     client.close()
\ No newline at end of file
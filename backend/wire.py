@@ -0,0 +1,83 @@
+"""Serialization for everything the server puts on the wire.
+
+WebSocket (/api/ws/{player_id}): JSON text frames are the default. A client
+can ask for MessagePack binary frames either with the "msgpack" WebSocket
+subprotocol or with the ?encoding=msgpack query flag; the server then answers
+with binary frames and accepts both binary (MessagePack) and text (JSON)
+frames from that client.
+
+JSON is produced by orjson when it is installed and by the stdlib json module
+otherwise. Both encoders (and MessagePack) handle datetime values directly, so
+room documents loaded from Mongo can be sent as they are. REST responses use
+DefaultResponse, which is backed by the same encoder.
+"""
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple, Union
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency, falls back to the stdlib json module
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional dependency, JSON keeps working without it
+    msgpack = None
+
+JSON = "json"
+MSGPACK = "msgpack"
+
+
+def _default(obj):
+    """Encode types the JSON/MessagePack encoders don't know natively"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+if orjson is not None:
+    def dumps(data: Any) -> str:
+        """Encode data as a JSON string"""
+        return orjson.dumps(data, default=_default).decode("utf-8")
+
+    loads = orjson.loads
+    DefaultResponse = ORJSONResponse
+else:
+    def dumps(data: Any) -> str:
+        """Encode data as a JSON string"""
+        return json.dumps(data, default=_default)
+
+    loads = json.loads
+    DefaultResponse = JSONResponse
+
+
+def negotiate_encoding(subprotocols, query_encoding: Optional[str]) -> Tuple[str, Optional[str]]:
+    """Pick the encoding for a connection.
+
+    Returns (encoding, subprotocol to accept or None).
+    """
+    if msgpack is not None:
+        if MSGPACK in (subprotocols or []):
+            return MSGPACK, MSGPACK
+        if query_encoding == MSGPACK:
+            return MSGPACK, None
+    return JSON, None
+
+
+def encode_message(data: Dict, encoding: str = JSON) -> Union[str, bytes]:
+    """Encode a message for the wire (text for JSON, bytes for MessagePack)"""
+    if encoding == MSGPACK:
+        return msgpack.packb(data, use_bin_type=True, default=_default)
+    return dumps(data)
+
+
+def decode_message(frame: Dict[str, Any]) -> Dict:
+    """Decode an incoming websocket.receive frame (text is JSON, bytes are MessagePack)"""
+    if frame.get("bytes") is not None:
+        if msgpack is None:
+            raise ValueError("Binary frame received but msgpack is not installed")
+        return msgpack.unpackb(frame["bytes"], raw=False)
+    return loads(frame["text"])
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for WebSocket message serialization.
+
+Compares the previous path (recursive json_serializable pre-pass + json.dumps)
+with the wire serializer (orjson with native datetimes, and MessagePack) on a
+realistic game_update payload.
+
+Run from the repository root: python bench_serialization.py
+"""
+
+import json
+import sys
+import timeit
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+import wire  # noqa: E402
+
+
+def legacy_json_serializable(obj):
+    """The pre-pass safe_send_json used to run before json.dumps"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    elif isinstance(obj, dict):
+        return {k: legacy_json_serializable(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [legacy_json_serializable(item) for item in obj]
+    else:
+        return obj
+
+
+def legacy_encode(data):
+    return json.dumps(legacy_json_serializable(data))
+
+
+def build_game_update():
+    """A mid-game room as broadcast by process_game_move"""
+    player_x, player_o = str(uuid.uuid4()), str(uuid.uuid4())
+    room = {
+        "room_code": "K7Q2ZD",
+        "players": {player_x: "Ana Beatriz", player_o: "João Pedro"},
+        "player_symbols": {player_x: "X", player_o: "O"},
+        "board": {
+            "board": ["X", None, "O", None, "X", None, "O", None, None],
+            "board_colors": ["green", None, "red", None, "green", None, "green", None, None],
+            "current_player": "O",
+            "game_status": "playing",
+            "winner": None
+        },
+        "created_at": datetime.utcnow(),
+        "current_question": None,
+        "selected_cell": None,
+        "current_player_id": player_o,
+        "subject": "historia",
+        "version": 6
+    }
+    return {
+        "type": "game_update",
+        "room": room,
+        "move": {
+            "player_id": player_x,
+            "player_name": "Ana Beatriz",
+            "cell_index": 4,
+            "is_correct": True,
+            "answer": "1822",
+            "correct_answer": "1822"
+        }
+    }
+
+
+def main():
+    message = build_game_update()
+    number = 20000
+
+    candidates = [("json_serializable + json.dumps (previous)", legacy_encode)]
+    label = "orjson" if wire.orjson is not None else "stdlib json (orjson not installed)"
+    candidates.append((f"wire.encode_message json [{label}]", lambda m: wire.encode_message(m, wire.JSON)))
+    if wire.msgpack is not None:
+        candidates.append(("wire.encode_message msgpack", lambda m: wire.encode_message(m, wire.MSGPACK)))
+
+    print(f"🔍 Serializing a game_update message {number} times")
+    print("=" * 60)
+    baseline = None
+    for name, encode in candidates:
+        seconds = min(timeit.repeat(lambda: encode(message), number=number, repeat=5))
+        per_call_us = seconds / number * 1e6
+        encoded = encode(message)
+        size = len(encoded.encode("utf-8") if isinstance(encoded, str) else encoded)
+        baseline = baseline or per_call_us
+        print(f"{name}")
+        print(f"   {per_call_us:7.2f} µs/message  {size:4d} bytes  {baseline / per_call_us:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
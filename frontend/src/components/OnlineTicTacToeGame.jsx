@@ -27,6 +27,7 @@ const OnlineTicTacToeGame = ({ roomData, onBackToSetup, onDisconnect, subject =
   const reconnectAttempts = useRef(0);
   const reconnectTimer = useRef(null);
   const lastPongAt = useRef(Date.now());
+  const wsTarget = useRef(null);
 
   const backendUrl = process.env.REACT_APP_BACKEND_URL;
   const wsUrl = backendUrl.replace('https://', 'wss://').replace('http://', 'ws://');
@@ -52,7 +53,8 @@ const OnlineTicTacToeGame = ({ roomData, onBackToSetup, onDisconnect, subject =
       }
 
       setConnectionStatus('connecting');
-      ws.current = new WebSocket(`${wsUrl}/api/ws/${roomData.player_id}`);
+      // The server may point us at the worker that owns the room (see 'redirect')
+      ws.current = new WebSocket(wsTarget.current || `${wsUrl}/api/ws/${roomData.player_id}?room=${roomData.room_code}`);
       
       ws.current.onopen = () => {
         console.log('WebSocket connected');
@@ -109,6 +111,11 @@ const OnlineTicTacToeGame = ({ roomData, onBackToSetup, onDisconnect, subject =
       case 'connected':
         lastPongAt.current = Date.now();
         break;
+      case 'redirect':
+        // Room lives on another server worker: reconnect there
+        wsTarget.current = message.url;
+        connectWebSocket();
+        break;
       case 'pong':
         // Heartbeat response, connection is alive
         lastPongAt.current = Date.now();
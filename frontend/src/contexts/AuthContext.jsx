@@ -1,4 +1,4 @@
-import React, { createContext, useContext, useState, useEffect } from 'react';
+import React, { createContext, useContext, useState, useEffect, useRef } from 'react';
 
 const AuthContext = createContext();
 
@@ -10,9 +10,72 @@ export const useAuth = () => {
   return context;
 };
 
+const backendUrl = process.env.REACT_APP_BACKEND_URL;
+
 export const AuthProvider = ({ children }) => {
   const [user, setUser] = useState(null);
   const [isLoading, setIsLoading] = useState(true);
+  const renewTimer = useRef(null);
+
+  const clearSession = () => {
+    if (renewTimer.current) clearTimeout(renewTimer.current);
+    localStorage.removeItem('auth_token');
+    localStorage.removeItem('refresh_token');
+    localStorage.removeItem('user_id');
+    localStorage.removeItem('username');
+    setUser(null);
+  };
+
+  // Renew the access token shortly before it expires, using the refresh token
+  const scheduleRenewal = (expiresIn) => {
+    if (renewTimer.current) clearTimeout(renewTimer.current);
+    const delay = Math.max(expiresIn * 0.8, 30) * 1000;
+    renewTimer.current = setTimeout(renewSession, delay);
+  };
+
+  // Use the session another tab stored after renewing it (same localStorage)
+  const adoptStoredSession = (sentToken) => {
+    const storedToken = localStorage.getItem('refresh_token');
+    if (!storedToken || storedToken === sentToken) return false;
+    setUser({
+      id: localStorage.getItem('user_id'),
+      username: localStorage.getItem('username'),
+      token: localStorage.getItem('auth_token')
+    });
+    scheduleRenewal(1800);
+    return true;
+  };
+
+  const renewSession = async (attempt = 0) => {
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (!refreshToken) return;
+    try {
+      const response = await fetch(`${backendUrl}/api/auth/refresh`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+      });
+      if (response.ok) {
+        login(await response.json());
+      } else if (response.status === 409) {
+        // Another tab renewed with the same token a moment ago: take its tokens
+        // once it has stored them, instead of logging out
+        if (!adoptStoredSession(refreshToken)) {
+          if (renewTimer.current) clearTimeout(renewTimer.current);
+          renewTimer.current = setTimeout(() => {
+            if (!adoptStoredSession(refreshToken) && attempt < 5) renewSession(attempt + 1);
+          }, 1000);
+        }
+      } else if (response.status === 401) {
+        if (!adoptStoredSession(refreshToken)) clearSession();
+      } else {
+        scheduleRenewal(60);
+      }
+    } catch (_) {
+      // Offline: keep the stored session and try again later
+      scheduleRenewal(60);
+    }
+  };
 
   useEffect(() => {
     // Check for stored authentication on component mount
@@ -26,11 +89,20 @@ export const AuthProvider = ({ children }) => {
         username: username,
         token: token
       });
+      renewSession();
     }
     setIsLoading(false);
+    return () => renewTimer.current && clearTimeout(renewTimer.current);
   }, []);
 
   const login = (userData) => {
+    localStorage.setItem('auth_token', userData.access_token);
+    localStorage.setItem('user_id', userData.user_id);
+    localStorage.setItem('username', userData.username);
+    if (userData.refresh_token) {
+      localStorage.setItem('refresh_token', userData.refresh_token);
+      scheduleRenewal(userData.expires_in || 1800);
+    }
     setUser({
       id: userData.user_id,
       username: userData.username,
@@ -39,10 +111,16 @@ export const AuthProvider = ({ children }) => {
   };
 
   const logout = () => {
-    localStorage.removeItem('auth_token');
-    localStorage.removeItem('user_id');
-    localStorage.removeItem('username');
-    setUser(null);
+    const refreshToken = localStorage.getItem('refresh_token');
+    if (refreshToken) {
+      // Revoke the session server-side; the local logout does not wait for it
+      fetch(`${backendUrl}/api/auth/logout`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+      }).catch(() => {});
+    }
+    clearSession();
   };
 
   const value = {
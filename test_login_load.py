@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Login storm load test: WebSocket latency must stay flat while logins hash passwords
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import time
+import requests
+import websockets
+
+BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8001/api")
+WS_URL = BACKEND_URL.replace("https://", "wss://").replace("http://", "ws://")
+
+# One client IP and one username: to load the hash pool rather than the auth rate
+# limiter, run the server with AUTH_BURST_PER_IP / AUTH_BURST_PER_USERNAME raised
+LOGIN_CONCURRENCY = int(os.environ.get("LOGIN_CONCURRENCY", "32"))
+LOGINS_TOTAL = int(os.environ.get("LOGINS_TOTAL", "200"))
+PING_INTERVAL = 0.05  # seconds between WebSocket pings
+LATENCY_BUDGET_MS = float(os.environ.get("LATENCY_BUDGET_MS", "100"))  # allowed p99 during the storm
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def measure_pings(ws, stop: asyncio.Event, samples: list):
+    """Ping/pong round trips on a game WebSocket until stop is set"""
+    while not stop.is_set():
+        sent = time.perf_counter()
+        await ws.send(json.dumps({"type": "ping"}))
+        while True:
+            msg = json.loads(await ws.recv())
+            if msg.get("type") == "pong":
+                break
+        samples.append((time.perf_counter() - sent) * 1000)
+        await asyncio.sleep(PING_INTERVAL)
+
+
+def login_once(session: requests.Session) -> int:
+    response = session.post(f"{BACKEND_URL}/auth/login", json={"username": "admin", "password": "123456"})
+    return response.status_code
+
+
+async def login_storm():
+    """Fire LOGINS_TOTAL logins, LOGIN_CONCURRENCY at a time"""
+    session = requests.Session()
+    semaphore = asyncio.Semaphore(LOGIN_CONCURRENCY)
+    statuses = {}
+
+    async def one():
+        async with semaphore:
+            status = await asyncio.to_thread(login_once, session)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(LOGINS_TOTAL)))
+    return statuses, time.perf_counter() - started
+
+
+async def test_login_load():
+    """WebSocket ping latency before and during a login storm"""
+    print("🔍 TESTING WEBSOCKET LATENCY DURING A LOGIN STORM")
+    print("=" * 60)
+
+    requests.post(f"{BACKEND_URL}/auth/create-test-user")
+    response = requests.post(f"{BACKEND_URL}/rooms/create", json={"player_name": "LoadTester"})
+    if response.status_code != 200:
+        print(f"❌ Failed to create room: {response.status_code}")
+        return False
+    room = response.json()
+    print(f"✅ Room created: {room['room_code']}")
+
+    async with websockets.connect(f"{WS_URL}/ws/{room['player_id']}") as ws:
+        await ws.recv()  # connected message
+        await ws.send(json.dumps({"type": "join_room", "room_code": room["room_code"]}))
+
+        print("Step 1: Baseline latency (3s, no logins)...")
+        baseline = []
+        stop = asyncio.Event()
+        pinger = asyncio.create_task(measure_pings(ws, stop, baseline))
+        await asyncio.sleep(3)
+        stop.set()
+        await pinger
+
+        print(f"Step 2: Latency during {LOGINS_TOTAL} logins ({LOGIN_CONCURRENCY} concurrent)...")
+        during = []
+        stop = asyncio.Event()
+        pinger = asyncio.create_task(measure_pings(ws, stop, during))
+        statuses, elapsed = await login_storm()
+        stop.set()
+        await pinger
+
+    print(f"\n📊 Results:")
+    print(f"   Logins: {statuses} in {elapsed:.1f}s ({LOGINS_TOTAL / elapsed:.0f}/s)")
+    for label, samples in (("baseline", baseline), ("storm", during)):
+        print(f"   {label:9s} pings={len(samples):4d} "
+              f"p50={statistics.median(samples):6.1f}ms p99={percentile(samples, 99):6.1f}ms max={max(samples):6.1f}ms")
+
+    p99 = percentile(during, 99)
+    if p99 > LATENCY_BUDGET_MS:
+        print(f"\n🚨 WebSocket p99 {p99:.1f}ms during the storm exceeds {LATENCY_BUDGET_MS:.0f}ms")
+        return False
+    print(f"\n✅ WebSocket latency unaffected by the login storm (p99 {p99:.1f}ms)")
+    return True
+
+if __name__ == "__main__":
+    result = asyncio.run(test_login_load())
+    print(f"\nTest result: {'PASSED' if result else 'FAILED'}")
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The backend is a flat set of modules run from backend/ (server.py imports them by name)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
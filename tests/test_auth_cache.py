@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+import cache
+import server
+from cache import TTLCache
+
+USER = {"id": "u1", "username": "ana", "hashed_password": "hash", "created_at": datetime(2024, 1, 1)}
+
+
+class FakeUsers:
+    """Stands in for db.users: counts find_one calls"""
+
+    def __init__(self, users):
+        self.users = users
+        self.lookups = 0
+
+    async def find_one(self, query):
+        self.lookups += 1
+        return next((dict(u) for u in self.users if all(u.get(k) == v for k, v in query.items())), None)
+
+
+class FakeDB:
+    def __init__(self, users):
+        self.users = FakeUsers(users)
+
+
+@pytest.fixture
+def auth(monkeypatch):
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(cache.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(server, "db", FakeDB([USER]))
+    monkeypatch.setattr(server, "auth_cache", TTLCache(maxsize=100, ttl=60))
+    monkeypatch.setattr(server, "user_lookup_cache", TTLCache(maxsize=100, ttl=60))
+    monkeypatch.setattr(server, "AUTH_MODE", "cached")
+    return clock
+
+
+def token(minutes=30, **claims):
+    data = {"sub": USER["id"], "username": USER["username"], **claims}
+    return server.create_access_token(data, expires_delta=timedelta(minutes=minutes))
+
+
+def current_user(tok):
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=tok)
+    return asyncio.run(server.get_current_user(credentials))
+
+
+def test_cached_mode_looks_user_up_once(auth):
+    tok = token()
+    first = current_user(tok)
+    second = current_user(tok)
+    assert first.username == second.username == "ana"
+    assert server.db.users.lookups == 1
+    assert server.auth_cache.hits == 1
+
+
+def test_cache_entry_expires_after_ttl(auth):
+    tok = token()
+    current_user(tok)
+    auth["now"] += 61
+    current_user(tok)
+    assert server.db.users.lookups == 2
+
+
+def test_cache_entry_never_outlives_the_token(auth):
+    tok = token(minutes=0.5)  # 30s, shorter than AUTH_CACHE_TTL
+    current_user(tok)
+    auth["now"] += 31
+    assert server.auth_cache.get(tok) is None
+
+
+def test_invalidate_cached_user_forces_a_lookup(auth):
+    tok = token()
+    current_user(tok)
+    server.user_lookup_cache.set("ana", server.User(**USER))
+    server.invalidate_cached_user("u1")
+    assert server.user_lookup_cache.get("ana") is None
+    current_user(tok)
+    assert server.db.users.lookups == 2
+
+
+def test_invalidate_keeps_other_users(auth):
+    tok = token()
+    current_user(tok)
+    server.invalidate_cached_user("someone-else")
+    current_user(tok)
+    assert server.db.users.lookups == 1
+
+
+def test_db_mode_does_not_cache(auth, monkeypatch):
+    monkeypatch.setattr(server, "AUTH_MODE", "db")
+    tok = token()
+    current_user(tok)
+    current_user(tok)
+    assert server.db.users.lookups == 2
+    assert len(server.auth_cache) == 0
+
+
+def test_stateless_mode_trusts_claims(auth, monkeypatch):
+    monkeypatch.setattr(server, "AUTH_MODE", "stateless")
+    user = current_user(token())
+    assert (user.id, user.username) == ("u1", "ana")
+    assert server.db.users.lookups == 0
+
+
+def test_stateless_mode_falls_back_without_username_claim(auth, monkeypatch):
+    monkeypatch.setattr(server, "AUTH_MODE", "stateless")
+    tok = server.create_access_token({"sub": "u1"}, expires_delta=timedelta(minutes=5))
+    assert current_user(tok).username == "ana"
+    assert server.db.users.lookups == 1
+
+
+def test_invalid_token_is_rejected_and_not_cached(auth):
+    with pytest.raises(HTTPException) as error:
+        current_user("not-a-jwt")
+    assert error.value.status_code == 401
+    assert len(server.auth_cache) == 0
@@ -0,0 +1,83 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import server
+from wire import JSON, MSGPACK, dumps
+
+
+class FakeSocket:
+    def __init__(self, encoding=JSON, updates="full", send_delay=0.0):
+        self.state = SimpleNamespace(encoding=encoding, updates=updates)
+        self.send_delay = send_delay
+        self.sent = []
+        self.closed_with = None
+
+    async def send_text(self, data):
+        await asyncio.sleep(self.send_delay)
+        self.sent.append(data)
+
+    async def send_bytes(self, data):
+        await asyncio.sleep(self.send_delay)
+        self.sent.append(data)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    sockets = {}
+    monkeypatch.setattr(server, "connections", sockets)
+    monkeypatch.setattr(server, "WS_SEND_TIMEOUT", 0.05)
+    return sockets
+
+
+def deliver(player_ids, message, delta_message=None):
+    async def main():
+        await server.deliver_to_connections(player_ids, message, delta_message)
+        # Let the close tasks of dropped sockets run
+        while server.closing_sockets:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+
+
+def test_each_encoding_is_encoded_once(connections, monkeypatch):
+    encoded = []
+    real_encode = server.encode_message
+    monkeypatch.setattr(server, "encode_message", lambda data, enc: encoded.append(enc) or real_encode(data, enc))
+    connections.update(a=FakeSocket(), b=FakeSocket(), c=FakeSocket(updates="delta"))
+
+    deliver(["a", "b", "c", "offline"], {"type": "game_update"}, {"type": "game_delta"})
+    assert encoded == [JSON, JSON]
+    assert connections["a"].sent == connections["b"].sent == [dumps({"type": "game_update"})]
+    assert connections["c"].sent == [dumps({"type": "game_delta"})]
+
+
+def test_slow_socket_is_dropped_and_closed(connections):
+    connections.update(fast=FakeSocket(), slow=FakeSocket(send_delay=1))
+    slow = connections["slow"]
+
+    deliver(["fast", "slow"], {"type": "game_update"})
+    assert list(connections) == ["fast"]
+    assert slow.closed_with == 1011
+    assert not server.closing_sockets
+
+
+def test_encoding_failure_only_skips_that_encoding(connections, monkeypatch):
+    real_encode = server.encode_message
+
+    def encode(data, encoding):
+        if encoding == MSGPACK:
+            raise TypeError("not packable")
+        return real_encode(data, encoding)
+
+    monkeypatch.setattr(server, "encode_message", encode)
+    connections.update(text=FakeSocket(), binary=FakeSocket(encoding=MSGPACK))
+
+    deliver(["text", "binary"], {"type": "game_update"})
+    assert connections["text"].sent == [dumps({"type": "game_update"})]
+    assert connections["binary"].sent == []
+    assert "binary" in connections  # an encoding problem is not the connection's fault
@@ -0,0 +1,75 @@
+import cache
+from cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(monkeypatch, maxsize=3, ttl=10.0):
+    clock = FakeClock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    return TTLCache(maxsize=maxsize, ttl=ttl), clock
+
+
+def test_hit_and_miss(monkeypatch):
+    c, _ = make_cache(monkeypatch)
+    assert c.get("a") is None
+    c.set("a", 1)
+    assert c.get("a") == 1
+    assert "a" in c
+    assert (c.hits, c.misses) == (2, 1)
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    c, clock = make_cache(monkeypatch)
+    c.set("a", 1)
+    clock.now += 9.9
+    assert c.get("a") == 1
+    clock.now += 0.1
+    assert c.get("a") is None
+    assert len(c) == 0
+
+
+def test_per_entry_ttl_is_capped_by_cache_ttl(monkeypatch):
+    c, clock = make_cache(monkeypatch)
+    c.set("short", 1, ttl=2)
+    c.set("long", 2, ttl=60)
+    clock.now += 5
+    assert c.get("short") is None
+    assert c.get("long") == 2
+    clock.now += 5
+    assert c.get("long") is None
+
+
+def test_non_positive_ttl_is_not_stored(monkeypatch):
+    c, _ = make_cache(monkeypatch)
+    c.set("expired", 1, ttl=-5)
+    assert len(c) == 0
+
+
+def test_least_recently_used_is_evicted(monkeypatch):
+    c, _ = make_cache(monkeypatch, maxsize=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.get("a")
+    c.set("c", 3)
+    assert c.get("b") is None
+    assert c.get("a") == 1
+    assert c.get("c") == 3
+
+
+def test_discard_where_and_pop(monkeypatch):
+    c, _ = make_cache(monkeypatch)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.set("c", 3)
+    assert c.discard_where(lambda value: value % 2 == 1) == 2
+    assert c.get("b") == 2
+    c.pop("b")
+    c.pop("missing")
+    assert len(c) == 0
@@ -0,0 +1,47 @@
+import pytest
+
+from cluster import HashRing, RoomRouter
+
+CODES = [f"R{i:05d}" for i in range(5000)]
+
+
+def test_ring_is_deterministic_and_uses_every_node():
+    ring = HashRing(["a", "b", "c"])
+    owners = [ring.owner(code) for code in CODES]
+    assert owners == [HashRing(["c", "b", "a"]).owner(code) for code in CODES]
+    assert set(owners) == {"a", "b", "c"}
+
+
+def test_adding_a_node_only_moves_rooms_to_it():
+    before, after = HashRing(["a", "b", "c"]), HashRing(["a", "b", "c", "d"])
+    moved = [code for code in CODES if before.owner(code) != after.owner(code)]
+    assert all(after.owner(code) == "d" for code in moved)
+    assert 0.1 < len(moved) / len(CODES) < 0.4
+
+
+def test_empty_ring_owns_nothing():
+    assert HashRing([]).owner("ABC") is None
+
+
+def test_router_without_workers_keeps_every_room_local():
+    router = RoomRouter(self_url=None)
+    assert not router.enabled
+    assert router.is_member and router.is_local("ABC123")
+
+
+def test_router_requires_its_own_url():
+    with pytest.raises(ValueError):
+        RoomRouter(self_url=None, workers=["http://w1"])
+
+
+def test_router_follows_the_workers_file(tmp_path):
+    workers_file = tmp_path / "workers.txt"
+    workers_file.write_text("http://w1/\nhttp://w2\n")
+    router = RoomRouter(self_url="http://w1", workers_file=str(workers_file))
+    assert router.ring.nodes == ("http://w1", "http://w2")
+    assert not router.refresh()
+
+    workers_file.write_text("# draining w1\nhttp://w2\n")
+    assert router.refresh()
+    assert not router.is_member
+    assert not any(router.is_local(code) for code in CODES[:50])
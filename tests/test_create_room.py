@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+import server
+from room_codes import RoomCodeAllocator
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = mongomock_motor.AsyncMongoMockClient()["test"]
+    monkeypatch.setattr(server, "db", database)
+    monkeypatch.setattr(server, "rooms", {})
+    monkeypatch.setattr(server, "player_rooms", {})
+    return database
+
+
+def create_room():
+    request = Request({"type": "http", "client": ("10.0.0.1", 5000), "headers": []})
+    return asyncio.run(server.create_room(server.CreateRoomRequest(player_name="Ana"), request))
+
+
+def same_sequence():
+    return RoomCodeAllocator(key=b"k", start=7)
+
+
+def test_taken_code_is_skipped(db, monkeypatch):
+    # Another process with the same worker id already created a room with the next code
+    taken = same_sequence().allocate()
+    asyncio.run(db.game_rooms.insert_one({"_id": taken, "room_code": taken}))
+    monkeypatch.setattr(server, "room_code_allocator", same_sequence())
+
+    response = create_room()
+    assert response.room_code != taken
+    assert response.room_code in server.rooms
+    assert asyncio.run(db.game_rooms.count_documents({})) == 2
+
+
+def test_gives_up_after_the_configured_attempts(db, monkeypatch):
+    codes = same_sequence()
+    for _ in range(3):
+        code = codes.allocate()
+        asyncio.run(db.game_rooms.insert_one({"_id": code, "room_code": code}))
+    monkeypatch.setattr(server, "room_code_allocator", same_sequence())
+    monkeypatch.setattr(server, "ROOM_CODE_ATTEMPTS", 3)
+
+    with pytest.raises(HTTPException) as raised:
+        create_room()
+    assert raised.value.status_code == 503
+    assert server.rooms == {}
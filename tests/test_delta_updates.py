@@ -0,0 +1,81 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+
+X, O = "player-x", "player-o"
+
+
+class FakeSocket:
+    def __init__(self, updates):
+        self.state = SimpleNamespace(encoding="json", updates=updates)
+        self.sent = []
+
+    async def send_text(self, data):
+        self.sent.append(json.loads(data))
+
+
+class FakeWriter:
+    def __init__(self):
+        self.updates = []
+
+    async def update(self, room_code, fields, final=False):
+        self.updates.append(fields)
+
+
+@pytest.fixture
+def room(monkeypatch):
+    room = {
+        "room_code": "ABC123",
+        "players": {X: "Ana", O: "Bia"},
+        "player_symbols": {X: "X", O: "O"},
+        "board": {"board": [None] * 9, "board_colors": [None] * 9, "current_player": "X",
+                  "game_status": "playing", "winner": None},
+        "current_question": None,
+        "selected_cell": None,
+        "current_player_id": X,
+        "version": 5,
+    }
+    monkeypatch.setattr(server, "rooms", {"ABC123": room})
+    monkeypatch.setattr(server, "connections", {X: FakeSocket("full"), O: FakeSocket("delta")})
+    monkeypatch.setattr(server, "room_writer", FakeWriter())
+    return room
+
+
+def test_move_sends_full_update_or_delta_per_connection(room):
+    question = {"question": "?", "correctAnswer": "a"}
+    asyncio.run(server.process_game_move("ABC123", X, 4, "a", question))
+
+    [full] = server.connections[X].sent
+    [delta] = server.connections[O].sent
+    assert full["type"] == "game_update" and full["room"]["board"]["board"][4] == "X"
+    assert delta == {
+        "type": "game_delta", "room_code": "ABC123", "version": 6, "base_version": 5,
+        "cell_index": 4, "symbol": "X", "color": "green", "current_player": "O",
+        "current_player_id": O, "game_status": "playing", "winner": None, "move": full["move"],
+    }
+    assert server.room_writer.updates[-1]["version"] == 6
+
+
+class NoRooms:
+    async def find_one(self, query):
+        return None
+
+
+def test_sync_answers_in_sync_or_with_the_full_room(room, monkeypatch):
+    monkeypatch.setattr(server, "WS_SERVER_PING", False)
+    monkeypatch.setattr(server, "db", SimpleNamespace(game_rooms=NoRooms()))
+    client = TestClient(server.app)
+    with client.websocket_connect(f"/api/ws/{O}?updates=delta") as ws:
+        assert ws.receive_json()["type"] == "connected"
+        ws.send_json({"type": "sync", "room_code": "ABC123", "version": 5})
+        assert ws.receive_json() == {"type": "in_sync", "version": 5}
+        ws.send_json({"type": "sync", "room_code": "ABC123", "version": 3})
+        state = ws.receive_json()
+        assert state["type"] == "room_state" and state["room"]["version"] == 5
+        ws.send_json({"type": "sync", "room_code": "ZZZ999", "version": 0})
+        assert ws.receive_json()["type"] == "error"
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+import server
+
+
+class FakeCollection:
+    def __init__(self, indexes=None):
+        self.indexes = {"_id_": {"key": [("_id", 1)]}, **(indexes or {})}
+        self.created = []
+
+    async def index_information(self):
+        return self.indexes
+
+    async def create_index(self, keys, **options):
+        self.created.append(options["name"])
+        self.indexes[options["name"]] = {"key": keys, **options}
+
+
+class FakeDB:
+    def __init__(self, collections):
+        self.collections = collections
+        self.commands = []
+
+    def __getitem__(self, name):
+        return self.collections.setdefault(name, FakeCollection())
+
+    async def command(self, command):
+        self.commands.append(command)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = FakeDB({})
+    monkeypatch.setattr(server, "db", database)
+    monkeypatch.setattr(server, "index_report", {})
+    return database
+
+
+def test_missing_indexes_are_created_once(db):
+    report = asyncio.run(server.ensure_indexes())
+    assert len(report["created"]) == len(server.REQUIRED_INDEXES) and not report["failed"]
+    assert db["users"].created == ["username_unique", "id_unique"]
+
+    again = asyncio.run(server.ensure_indexes())
+    assert again["created"] == [] and len(again["existing"]) == len(server.REQUIRED_INDEXES)
+    assert server.index_report == again
+
+
+def test_changed_ttl_is_updated_in_place(db):
+    db.collections["game_rooms"] = FakeCollection({
+        "created_at_1": {"key": [("created_at", 1)], "expireAfterSeconds": 60}
+    })
+    report = asyncio.run(server.ensure_indexes())
+    assert report["updated"] == ["game_rooms.created_at_ttl"]
+    assert db.commands == [{"collMod": "game_rooms", "index": {
+        "keyPattern": {"created_at": 1}, "expireAfterSeconds": server.GAME_ROOM_TTL_SECONDS
+    }}]
+    assert db["game_rooms"].created == []
+
+
+@pytest.mark.parametrize("collection, index, label", [
+    ("users", {"key": [("username", 1)]}, "users.username_unique"),  # not unique
+    ("rankings", {"key": [("points", -1)], "unique": True}, "rankings.points_desc"),  # unexpectedly unique
+    ("refresh_tokens", {"key": [("expires_at", 1)]}, "refresh_tokens.expires_at_ttl"),  # no TTL
+])
+def test_mismatches_that_need_a_rebuild_are_reported_as_failed(db, collection, index, label):
+    db.collections[collection] = FakeCollection({"old": index})
+    report = asyncio.run(server.ensure_indexes())
+    assert report["failed"] == [label]
+    assert db.commands == []
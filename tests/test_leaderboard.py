@@ -0,0 +1,106 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from leaderboard import Leaderboard
+
+
+def ranking(player_id, points, games_played, games_won=0):
+    return {"_id": f"id-{player_id}", "player_id": player_id, "username": player_id.upper(),
+            "points": points, "games_played": games_played, "games_won": games_won}
+
+
+def test_merge_orders_players_by_points():
+    board = Leaderboard()
+    board.merge([ranking("a", 3, 1, 1), ranking("b", 7, 3, 2), ranking("c", 1, 1)])
+    assert [entry["player_id"] for entry in board.top(10)] == ["b", "a", "c"]
+    assert board.rank("a")[0] == 2
+    assert not board.loaded
+    board.mark_loaded()
+    assert board.loaded
+
+
+def test_results_recorded_during_a_read_survive_the_merge():
+    board = Leaderboard()
+    board.merge([ranking("a", 3, 1, 1), ranking("b", 1, 1)])
+
+    # The reconcile read was taken before these results were recorded
+    snapshot = [ranking("a", 3, 1, 1), ranking("b", 1, 1)]
+    board.record_result("b", "B", True, datetime.utcnow())
+    board.record_result("c", "C", True, datetime.utcnow())
+    board.merge(snapshot)
+
+    assert [(entry["player_id"], entry["points"]) for entry in board.top(10)] == [("b", 4), ("a", 3), ("c", 3)]
+
+
+def test_newer_documents_replace_local_entries():
+    board = Leaderboard()
+    board.merge([ranking(f"p{i}", i, 1) for i in range(20)])
+    board.merge([ranking("p0", 50, 10, 8)])  # another worker's games
+    assert board.top(1)[0]["player_id"] == "p0"
+    assert board.rank("p0") == (1, board.top(1)[0])
+    assert len(board) == 20
+
+
+class FakeCursor:
+    def __init__(self, rankings, fail=False, delay=0.0):
+        self.rankings, self.fail, self.delay = rankings, fail, delay
+
+    def sort(self, *args):
+        return self
+
+    def limit(self, n):
+        return self
+
+    async def to_list(self, length):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("mongo down")
+        return self.rankings
+
+
+class FakeRankings:
+    def __init__(self, rankings, fail=False, delay=0.0):
+        self.rankings, self.fail, self.delay = rankings, fail, delay
+        self.reads = 0
+
+    def find(self, query, projection):
+        self.reads += 1
+        return FakeCursor(self.rankings, self.fail, self.delay)
+
+
+@pytest.fixture
+def fresh_board(monkeypatch):
+    import server
+
+    monkeypatch.setattr(server, "leaderboard", Leaderboard())
+    monkeypatch.setattr(server, "leaderboard_lock", asyncio.Lock())
+    monkeypatch.setattr(server, "leaderboard_retry_at", 0.0)
+    return server
+
+
+def test_concurrent_requests_share_one_load(fresh_board, monkeypatch):
+    server = fresh_board
+    rankings = FakeRankings([ranking("a", 3, 1, 1)], delay=0.02)
+    monkeypatch.setattr(server, "rankings_collection", rankings)
+
+    async def main():
+        return await asyncio.gather(*(server.get_rankings(10) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert rankings.reads == 1
+    assert all(result[0]["name"] == "A" for result in results)
+
+
+def test_failed_load_answers_503_without_rescanning(fresh_board, monkeypatch):
+    server = fresh_board
+    rankings = FakeRankings([], fail=True)
+    monkeypatch.setattr(server, "rankings_collection", rankings)
+
+    for _ in range(3):
+        with pytest.raises(HTTPException) as raised:
+            asyncio.run(server.get_rankings(10))
+        assert raised.value.status_code == 503
+    assert rankings.reads == 1
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+from passlib.context import CryptContext
+
+from passwords import PasswordHasher, PasswordHasherBusy
+
+FAST = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+
+
+@pytest.mark.parametrize("kind", ["thread", "process"])
+def test_hash_and_verify_in_the_pool(kind):
+    hasher = PasswordHasher(FAST, workers=2, kind=kind)
+
+    async def main():
+        hashed = await hasher.hash("segredo")
+        return hashed, await hasher.verify("segredo", hashed), await hasher.verify("errado", hashed)
+
+    try:
+        hashed, right, wrong = asyncio.run(main())
+    finally:
+        hasher.shutdown()
+    assert hashed.startswith("$2b$04$") and right and not wrong
+    assert hasher.stats()["completed"] == 3 and hasher.in_flight == 0
+
+
+def test_calls_over_max_pending_are_rejected():
+    hasher = PasswordHasher(FAST, workers=1, max_pending=2)
+
+    async def main():
+        return await asyncio.gather(*(hasher.hash("segredo") for _ in range(4)), return_exceptions=True)
+
+    try:
+        results = asyncio.run(main())
+    finally:
+        hasher.shutdown()
+    assert sum(isinstance(r, PasswordHasherBusy) for r in results) == 2
+    stats = hasher.stats()
+    assert stats["rejected"] == 2 and stats["completed"] == 2 and stats["max_queued"] == 1
+
+
+def test_unknown_pool_kind():
+    with pytest.raises(ValueError):
+        PasswordHasher(FAST, kind="fiber")
@@ -0,0 +1,46 @@
+import pytest
+from passlib.context import CryptContext
+
+import passwords
+from passwords import build_password_context
+
+WEAK = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("segredo")
+
+
+@pytest.fixture(scope="module")
+def bcrypt_policy():
+    return build_password_context("bcrypt", rounds=4)
+
+
+def test_cost_never_goes_below_the_minimum(bcrypt_policy):
+    _, policy = bcrypt_policy
+    assert policy["scheme"] == "bcrypt" and policy["rounds"] == passwords.BCRYPT_MIN_ROUNDS
+
+
+def test_weaker_hash_is_rehashed_on_login(bcrypt_policy):
+    context, _ = bcrypt_policy
+    assert context.needs_update(WEAK)
+    valid, new_hash = context.verify_and_update("segredo", WEAK)
+    assert valid and new_hash.startswith(f"$2b${passwords.BCRYPT_MIN_ROUNDS}$")
+    assert not context.needs_update(new_hash)
+
+
+def test_stronger_hash_is_kept(bcrypt_policy):
+    context, _ = bcrypt_policy
+    stronger = WEAK.replace("$2b$04$", f"$2b${passwords.BCRYPT_MIN_ROUNDS + 1}$")  # needs_update only reads the cost
+    assert not context.needs_update(stronger)
+
+
+def test_unknown_scheme():
+    with pytest.raises(ValueError):
+        build_password_context("md5_crypt")
+
+
+@pytest.mark.skipif(not passwords.ARGON2_AVAILABLE, reason="argon2-cffi not installed")
+def test_argon2_deprecates_bcrypt():
+    context, policy = build_password_context("argon2", rounds=2, argon2_memory_kib=1024)
+    assert policy["scheme"] == "argon2" and policy["time_cost"] == 2
+    assert context.needs_update(WEAK)
+    valid, new_hash = context.verify_and_update("segredo", WEAK)
+    assert valid and new_hash.startswith("$argon2")
+    assert not context.needs_update(new_hash)
@@ -0,0 +1,88 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+
+
+class FakeSocket:
+    def __init__(self):
+        self.state = SimpleNamespace(encoding="json", updates="full")
+        self.sent = []
+
+    async def send_text(self, data):
+        self.sent.append(json.loads(data))
+
+
+class FakeWriter:
+    async def update(self, room_code, fields, final=False):
+        pass
+
+    def is_pending(self, room_code):
+        return False
+
+
+class StoredRooms:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def find_one(self, query):
+        return self.documents.get(query["_id"])
+
+
+def make_room(code, players):
+    return {
+        "room_code": code, "players": dict(players), "player_symbols": {pid: "X" for pid in players},
+        "board": {"board": [None] * 9, "board_colors": [None] * 9, "current_player": "X",
+                  "game_status": "waiting", "winner": None},
+        "created_at": None, "current_question": None, "selected_cell": None,
+        "current_player_id": next(iter(players)), "version": 0,
+    }
+
+
+@pytest.fixture
+def state(monkeypatch):
+    monkeypatch.setattr(server, "rooms", {})
+    monkeypatch.setattr(server, "player_rooms", {})
+    monkeypatch.setattr(server, "connections", {})
+    monkeypatch.setattr(server, "room_writer", FakeWriter())
+    monkeypatch.setattr(server, "WS_SERVER_PING", False)
+    stored = {}
+    monkeypatch.setattr(server, "db", SimpleNamespace(game_rooms=StoredRooms(stored)))
+    return stored
+
+
+def test_joining_and_loading_index_players(state):
+    server.rooms["ABC123"] = make_room("ABC123", {"p1": "Ana"})
+    joined = asyncio.run(server.add_player_to_room("ABC123", server.JoinRoomRequest(room_code="ABC123",
+                                                                                      player_name="Bia")))
+    assert server.player_rooms[joined.player_id] == "ABC123"
+    assert asyncio.run(server.get_player_room(joined.player_id))["player_count"] == 2
+
+    state["XYZ789"] = make_room("XYZ789", {"p3": "Caio", "p4": "Duda"})
+    asyncio.run(server.load_room_from_db("XYZ789"))
+    assert server.player_rooms["p3"] == server.player_rooms["p4"] == "XYZ789"
+
+
+def test_unloading_a_room_keeps_players_that_moved_on(state):
+    room = server.rooms["ABC123"] = make_room("ABC123", {"p1": "Ana", "p2": "Bia"})
+    server.index_room_players("ABC123", room)
+    server.player_rooms["p2"] = "NEW999"  # p2 already joined another room
+
+    assert asyncio.run(server.unload_room("ABC123", room))
+    assert server.player_rooms == {"p2": "NEW999"}
+    assert "ABC123" not in server.rooms
+
+
+def test_disconnect_notifies_the_rest_of_the_room(state):
+    room = server.rooms["ABC123"] = make_room("ABC123", {"p1": "Ana", "p2": "Bia"})
+    server.index_room_players("ABC123", room)
+    other = server.connections["p2"] = FakeSocket()
+
+    with TestClient(server.app).websocket_connect("/api/ws/p1") as ws:
+        assert ws.receive_json()["type"] == "connected"
+    assert "p1" not in server.connections
+    assert other.sent == [{"type": "player_disconnected", "player_name": "Ana"}]
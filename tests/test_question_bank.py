@@ -0,0 +1,26 @@
+from question_bank import QuestionBank, write_question_bank
+
+
+def make_bank(tmp_path):
+    questions = [{"id": i, "question": f"Q{i}", "options": ["a", "b"], "correctAnswer": "a",
+                  "period": "Geometria" if i % 3 == 0 else "Álgebra", "subject": "matematica"}
+                 for i in range(1, 31)]
+    path = tmp_path / "questions.jsonl"
+    write_question_bank(reversed(questions), path)
+    return QuestionBank(path)
+
+
+def test_pages_follow_id_order(tmp_path):
+    index = make_bank(tmp_path).subject_index("matematica")
+    positions, total, after_id = index.page(12)
+    assert total == 30 and after_id == 12
+    positions, _, after_id = index.page(12, after_id=24)
+    assert [index.ids[p] for p in positions] == [25, 26, 27, 28, 29, 30] and after_id is None
+
+
+def test_period_filter(tmp_path):
+    bank = make_bank(tmp_path)
+    positions, total, after_id = bank.subject_index("matematica").page(4, filters={"period": "Geometria"})
+    assert total == 10 and after_id == 12
+    assert [bank.get("matematica", p)["id"] for p in positions] == [3, 6, 9, 12]
+    assert bank.subject_index("matematica").page(5, filters={"period": "Cálculo"})[1] == 0
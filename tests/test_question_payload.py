@@ -0,0 +1,59 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+
+import server
+from question_bank import QuestionBank, write_question_bank
+
+
+def write_bank(path, count):
+    questions = [{"id": i, "question": f"Q{i}", "options": ["a", "b"], "correctAnswer": "a",
+                  "period": "Geometria", "subject": "matematica"} for i in range(1, count + 1)]
+    write_question_bank(questions, path)
+    return QuestionBank(path)
+
+
+@pytest.fixture
+def bank(tmp_path, monkeypatch):
+    current = {"bank": write_bank(tmp_path / "a.jsonl", 3)}
+    monkeypatch.setattr(server, "refresh_question_bank", lambda: current["bank"])
+    monkeypatch.setattr(server, "question_payload_cache", {})
+    return current
+
+
+def get(subject, if_none_match=None):
+    return asyncio.run(server.get_questions_by_subject(
+        subject, limit=None, after_id=None, fields=None, period=None, if_none_match=if_none_match
+    ))
+
+
+def test_payload_is_the_subject_as_json_with_a_strong_etag(bank):
+    response = get("matematica")
+    body = json.loads(response.body)
+    assert body["subject"] == "matematica" and body["total"] == 3
+    assert [q["id"] for q in body["questions"]] == [1, 2, 3]
+    assert response.headers["etag"].startswith('"') and response.headers["cache-control"] == "no-cache"
+    assert get("matematica").headers["etag"] == response.headers["etag"]
+
+
+@pytest.mark.parametrize("header", ["{etag}", "W/{etag}", '"other", {etag}', "*"])
+def test_matching_if_none_match_gets_304(bank, header):
+    etag = get("matematica").headers["etag"]
+    response = get("matematica", header.format(etag=etag))
+    assert response.status_code == 304 and response.headers["etag"] == etag
+
+
+def test_new_bank_gets_a_new_etag(bank, tmp_path):
+    etag = get("matematica").headers["etag"]
+    bank["bank"] = write_bank(tmp_path / "b.jsonl", 4)
+    response = get("matematica", etag)
+    assert response.status_code == 200 and response.headers["etag"] != etag
+    assert json.loads(response.body)["total"] == 4
+
+
+def test_unknown_subject_is_404(bank):
+    with pytest.raises(HTTPException) as raised:
+        get("fisica")
+    assert raised.value.status_code == 404
@@ -0,0 +1,33 @@
+from questions import FALLBACK_QUESTION, QuestionDeck
+
+
+class FakeBank:
+    def __init__(self, counts):
+        self.counts = counts
+
+    def count(self, subject=None):
+        return self.counts.get(subject, 0)
+
+    def get(self, subject, index):
+        return {"subject": subject, "id": index}
+
+
+def test_no_repeats_until_the_deck_is_exhausted():
+    deck = QuestionDeck("historia", bank=FakeBank({"historia": 25}))
+    first_round = [deck.draw()["id"] for _ in range(25)]
+    second_round = [deck.draw()["id"] for _ in range(25)]
+    assert sorted(first_round) == sorted(second_round) == list(range(25))
+
+
+def test_empty_subject_gets_the_fallback_question():
+    question = QuestionDeck("quimica", bank=FakeBank({})).draw()
+    assert question["question"] == FALLBACK_QUESTION["question"]
+    assert question["subject"] == "quimica"
+
+
+def test_legacy_question_lists_come_from_the_bank():
+    from questions import CHEMISTRY_QUESTIONS, HISTORY_QUESTIONS, MATH_QUESTIONS, QUESTIONS
+
+    assert len(HISTORY_QUESTIONS) >= 60 and len(CHEMISTRY_QUESTIONS) >= 40
+    assert {q["subject"] for q in MATH_QUESTIONS} == {"matematica"}
+    assert len(QUESTIONS) == len(HISTORY_QUESTIONS) + len(CHEMISTRY_QUESTIONS) + len(MATH_QUESTIONS)
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+import server
+from leaderboard import Leaderboard
+
+
+@pytest.fixture
+def rankings(monkeypatch):
+    collection = mongomock_motor.AsyncMongoMockClient()["test"]["rankings"]
+    monkeypatch.setattr(server, "rankings_collection", collection)
+    monkeypatch.setattr(server, "leaderboard", Leaderboard())
+    return collection
+
+
+def test_results_update_the_collection_and_the_leaderboard_alike(rankings):
+    async def main():
+        await server.update_player_rankings([("a", "Ana", True), ("b", "Bia", False)])
+        await server.update_player_rankings([("a", "Ana", False), ("b", "Bia", False)])  # a draw
+        await server.update_player_rankings([])
+        return {doc["player_id"]: doc async for doc in rankings.find({})}
+
+    stored = asyncio.run(main())
+    assert {pid: (d["points"], d["games_played"], d["games_won"], d["username"]) for pid, d in stored.items()} == {
+        "a": (4, 2, 1, "Ana"),
+        "b": (2, 2, 0, "Bia"),
+    }
+    top = server.leaderboard.top(10)
+    assert [(e["player_id"], e["points"], e["games_played"], e["games_won"]) for e in top] == [
+        ("a", 4, 2, 1), ("b", 2, 2, 0)
+    ]
+    # New players get the _id of their upserted document
+    assert top[0]["id"] == str(stored["a"]["_id"])
+    assert server.format_ranking(top[0])["winRate"] == 50.0
@@ -0,0 +1,39 @@
+import ratelimit
+from ratelimit import TokenBucketLimiter
+
+
+def test_burst_then_refill(monkeypatch):
+    now = {"t": 100.0}
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now["t"])
+    limiter = TokenBucketLimiter(rate=1.0, burst=3)
+
+    assert [limiter.acquire("ip") for _ in range(3)] == [0, 0, 0]
+    assert limiter.acquire("ip") == 1.0
+    assert limiter.rejected == 1
+
+    now["t"] += 1.0
+    assert limiter.acquire("ip") == 0
+    assert limiter.acquire("other") == 0  # keys have separate buckets
+
+
+def test_key_count_is_bounded():
+    limiter = TokenBucketLimiter(rate=1.0, burst=1, max_keys=2)
+    for key in ("a", "b", "c"):
+        limiter.acquire(key)
+    assert len(limiter) == 2
+    assert limiter.acquire("a") == 0  # evicted, so it starts with a full bucket again
+
+
+def test_a_class_behind_one_address_can_log_in_together(monkeypatch):
+    import server
+    from starlette.requests import Request
+
+    monkeypatch.setattr(server, "auth_ip_limiter", TokenBucketLimiter(rate=server.auth_ip_limiter.rate,
+                                                                      burst=server.auth_ip_limiter.burst))
+    monkeypatch.setattr(server, "auth_user_limiter", TokenBucketLimiter(rate=server.auth_user_limiter.rate,
+                                                                        burst=server.auth_user_limiter.burst))
+    school = Request({"type": "http", "client": ("200.1.2.3", 5000), "headers": []})
+    # Three classes of 40, each student trying twice
+    for attempt in range(2):
+        for student in range(120):
+            server.check_auth_rate(school, f"aluno{student}")
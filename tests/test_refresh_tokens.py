@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+import server
+from ratelimit import TokenBucketLimiter
+
+
+@pytest.fixture
+def db(monkeypatch):
+    database = mongomock_motor.AsyncMongoMockClient()["test"]
+    monkeypatch.setattr(server, "db", database)
+    monkeypatch.setattr(server, "auth_refresh_limiter", TokenBucketLimiter(rate=1, burst=60))
+    return database
+
+
+def http_request(ip="10.0.0.1"):
+    return Request({"type": "http", "client": (ip, 5000), "headers": []})
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def refresh(token, ip="10.0.0.1"):
+    return run(server.refresh_session(server.RefreshRequest(refresh_token=token), http_request(ip)))
+
+
+def status_of(call, *args):
+    with pytest.raises(HTTPException) as raised:
+        call(*args)
+    return raised.value.status_code
+
+
+def stored(db, token):
+    return run(db.refresh_tokens.find_one({"_id": server.hash_refresh_token(token)}))
+
+
+def test_refresh_rotates_the_token_within_its_session(db):
+    first = run(server.issue_session("u1", "ana"))
+    second = refresh(first.refresh_token)
+    assert second.refresh_token != first.refresh_token and second.user_id == "u1"
+    assert stored(db, second.refresh_token)["family_id"] == stored(db, first.refresh_token)["family_id"]
+    assert refresh(second.refresh_token).username == "ana"
+
+
+def test_rotated_token_is_kept_only_for_reuse_detection(db):
+    first = run(server.issue_session("u1", "ana"))
+    refresh(first.refresh_token)
+    spent = stored(db, first.refresh_token)
+    assert spent["used_at"] is not None
+    assert spent["expires_at"] <= datetime.utcnow() + timedelta(hours=server.REFRESH_REUSE_DETECTION_HOURS)
+
+
+def test_reuse_inside_the_grace_window_gets_409_and_keeps_the_session(db):
+    first = run(server.issue_session("u1", "ana"))
+    second = refresh(first.refresh_token)
+    assert status_of(refresh, first.refresh_token) == 409
+    assert refresh(second.refresh_token).user_id == "u1"
+
+
+def test_reuse_after_the_grace_window_revokes_the_session(db, monkeypatch):
+    monkeypatch.setattr(server, "REFRESH_REUSE_GRACE_SECONDS", 0)
+    first = run(server.issue_session("u1", "ana"))
+    second = refresh(first.refresh_token)
+    assert status_of(refresh, first.refresh_token) == 401
+    assert status_of(refresh, second.refresh_token) == 401
+
+
+def test_logout_revokes_one_session_or_all_of_them(db):
+    a, b, c = (run(server.issue_session("u1", "ana")) for _ in range(3))
+    run(server.logout(server.LogoutRequest(refresh_token=a.refresh_token)))
+    assert status_of(refresh, a.refresh_token) == 401
+    assert refresh(b.refresh_token).user_id == "u1"
+
+    run(server.logout(server.LogoutRequest(refresh_token=c.refresh_token, all_sessions=True)))
+    assert status_of(refresh, c.refresh_token) == 401
+
+
+def test_junk_tokens_are_limited_per_client_ip(db, monkeypatch):
+    monkeypatch.setattr(server, "auth_refresh_limiter", TokenBucketLimiter(rate=0.001, burst=3))
+    assert [status_of(refresh, f"junk-{i}") for i in range(4)] == [401, 401, 401, 429]
+    assert status_of(refresh, "junk-other-ip", "10.0.0.2") == 401
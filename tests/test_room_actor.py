@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from room_actor import RoomActors
+
+
+def test_commands_for_one_room_run_one_at_a_time_in_order():
+    log = []
+
+    async def command(name):
+        log.append(f"start {name}")
+        await asyncio.sleep(0.01)
+        log.append(f"end {name}")
+        return name
+
+    async def main():
+        actors = RoomActors()
+        results = await asyncio.gather(*(actors.submit("ROOM", command, n) for n in "abc"))
+        actors.stop_all()
+        return results
+
+    assert asyncio.run(main()) == ["a", "b", "c"]
+    assert log == ["start a", "end a", "start b", "end b", "start c", "end c"]
+
+
+def test_errors_reach_the_caller_and_the_actor_keeps_going():
+    async def fail():
+        raise ValueError("boom")
+
+    async def ok():
+        return "ok"
+
+    async def main():
+        actors = RoomActors()
+        with pytest.raises(ValueError):
+            await actors.submit("ROOM", fail)
+        result = await actors.submit("ROOM", ok)
+        actors.stop_all()
+        return result
+
+    assert asyncio.run(main()) == "ok"
+
+
+def test_idle_actors_exit():
+    async def noop():
+        return None
+
+    async def main():
+        actors = RoomActors(idle_timeout=0.01)
+        await actors.submit("ROOM", noop)
+        assert len(actors) == 1
+        await asyncio.sleep(0.05)
+        return len(actors)
+
+    assert asyncio.run(main()) == 0
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from room_backend import RedisRoomBackend
+
+
+def make_backends(count):
+    """Backends of `count` workers sharing one fake Redis server, with what each delivered"""
+    server = fakeredis.FakeServer()
+    delivered = [[] for _ in range(count)]
+    backends = []
+    for received in delivered:
+        async def deliver(player_ids, message, delta_message, received=received):
+            received.append((player_ids, message, delta_message))
+
+        backends.append(RedisRoomBackend(deliver, client=fakeredis.aioredis.FakeRedis(server=server)))
+    return backends, delivered
+
+
+async def wait_for(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_room_state_is_shared_between_workers():
+    async def main():
+        (a, b), _ = make_backends(2)
+        await a.store_room("ABC123", {"room_code": "ABC123", "players": {"p1": "Ana"}, "version": 3})
+        room = await b.fetch_room("ABC123")
+        missing = await b.fetch_room("ZZZ999")
+        return room, missing
+
+    room, missing = asyncio.run(main())
+    assert room == {"room_code": "ABC123", "players": {"p1": "Ana"}, "version": 3}
+    assert missing is None
+
+
+def test_store_is_a_compare_and_set_on_the_version():
+    async def main():
+        (a, b), _ = make_backends(2)
+        results = [
+            await a.store_room("ABC123", {"version": 0}, expected_version=None),
+            await b.store_room("ABC123", {"version": 0}, expected_version=None),  # already created
+            await b.store_room("ABC123", {"version": 1, "by": "b"}, expected_version=0),
+            await a.store_room("ABC123", {"version": 1, "by": "a"}, expected_version=0),  # stale copy
+        ]
+        return results, await a.fetch_room("ABC123")
+
+    results, room = asyncio.run(main())
+    assert results == [True, False, True, False]
+    assert room == {"version": 1, "by": "b"}
+
+
+def test_messages_reach_only_workers_subscribed_to_the_room():
+    async def main():
+        backends, delivered = make_backends(3)
+        for backend in backends:
+            await backend.start()
+        await backends[0].subscribe("ABC123")
+        await backends[1].subscribe("ABC123")
+        await backends[2].subscribe("OTHER1")
+        await backends[0].publish("ABC123", ["p1", "p2"], {"type": "move"}, {"type": "delta"})
+        await wait_for(lambda: delivered[0] and delivered[1])
+
+        await backends[1].unsubscribe("ABC123")
+        await backends[0].publish("ABC123", ["p1"], {"type": "again"})
+        await wait_for(lambda: len(delivered[0]) == 2)
+        await asyncio.sleep(0.05)
+        for backend in backends:
+            await backend.stop()
+        return delivered
+
+    first, second, other = asyncio.run(main())
+    assert first == [(["p1", "p2"], {"type": "move"}, {"type": "delta"}), (["p1"], {"type": "again"}, None)]
+    assert second == [(["p1", "p2"], {"type": "move"}, {"type": "delta"})]
+    assert other == []
@@ -0,0 +1,30 @@
+import pytest
+
+from room_codes import ALPHABET, CODE_LENGTH, RoomCodeAllocator
+
+
+def test_codes_are_unique_over_the_whole_space():
+    # A 4-character prefix leaves a 2-character body: 36**2 codes
+    allocator = RoomCodeAllocator(key=b"k", prefix="ABCD")
+    codes = [allocator.allocate() for _ in range(allocator.space)]
+    assert len(set(codes)) == allocator.space == len(ALPHABET) ** 2
+    assert all(len(code) == CODE_LENGTH and code.startswith("ABCD") for code in codes)
+
+
+def test_workers_never_overlap():
+    workers = [RoomCodeAllocator(key=b"k", prefix="ABCD", worker_id=w, workers=3) for w in range(3)]
+    seen = [{allocator.allocate() for _ in range(allocator.per_worker)} for allocator in workers]
+    assert not (seen[0] & seen[1] or seen[0] & seen[2] or seen[1] & seen[2])
+
+
+def test_permutation_depends_on_key():
+    a = RoomCodeAllocator(key=b"one")
+    b = RoomCodeAllocator(key=b"two")
+    assert [a.allocate() for _ in range(5)] != [b.allocate() for _ in range(5)]
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        RoomCodeAllocator(key=b"k", prefix="a-b")
+    with pytest.raises(ValueError):
+        RoomCodeAllocator(key=b"k", worker_id=2, workers=2)
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+import server
+from room_backend import RedisRoomBackend
+
+
+@pytest.fixture
+def shared_backend(monkeypatch):
+    """server with a Redis room backend on a fake server, and a second worker's view of it"""
+    fake = fakeredis.FakeServer()
+    published = []
+
+    async def deliver(player_ids, message, delta_message):
+        published.append(message)
+
+    backend = RedisRoomBackend(deliver, client=fakeredis.aioredis.FakeRedis(server=fake))
+    other_worker = RedisRoomBackend(deliver, client=fakeredis.aioredis.FakeRedis(server=fake))
+    monkeypatch.setattr(server, "room_backend", backend)
+    monkeypatch.setattr(server, "rooms", {})
+    monkeypatch.setattr(server, "player_rooms", {})
+    return backend, other_worker, published
+
+
+def room(version, players):
+    return {"room_code": "ABC123", "players": players, "player_symbols": {}, "board": {"game_status": "playing"},
+            "version": version}
+
+
+def test_command_is_rerun_when_another_worker_stored_the_room(shared_backend):
+    backend, other_worker, published = shared_backend
+    runs = []
+
+    async def command():
+        local = server.rooms["ABC123"]
+        if not runs:
+            # Another worker adds a player while this command is running
+            await other_worker.store_room("ABC123", room(2, {"a": "Ana", "b": "Bia"}), expected_version=1)
+        runs.append(dict(local["players"]))
+        local["moves"] = local.get("moves", 0) + 1
+        server.bump_room_version(local)
+        await server.broadcast_to_room("ABC123", {"type": "moved", "players": len(local["players"])})
+        return "done"
+
+    async def main():
+        await backend.start()
+        await backend.subscribe("ABC123")
+        await backend.store_room("ABC123", room(1, {"a": "Ana"}), expected_version=None)
+        result = await server.run_room_command("ABC123", command)
+        stored = await other_worker.fetch_room("ABC123")
+        for _ in range(100):
+            if published:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        await backend.stop()
+        return result, stored
+
+    result, stored = asyncio.run(main())
+    assert result == "done"
+    assert runs == [{"a": "Ana"}, {"a": "Ana", "b": "Bia"}]
+    assert stored["players"] == {"a": "Ana", "b": "Bia"} and stored["version"] == 3 and stored["moves"] == 1
+    # Only the run that got stored broadcast anything
+    assert published == [{"type": "moved", "players": 2}]
+
+
+def test_command_that_changes_nothing_is_not_stored(shared_backend, monkeypatch):
+    backend, _, _ = shared_backend
+    stores = []
+
+    async def command():
+        return server.rooms["ABC123"]["version"]
+
+    async def main():
+        await backend.store_room("ABC123", room(4, {"a": "Ana"}), expected_version=None)
+        original = backend.store_room
+        monkeypatch.setattr(backend, "store_room", lambda *args: stores.append(args) or original(*args))
+        return await server.run_room_command("ABC123", command)
+
+    assert asyncio.run(main()) == 4
+    assert stores == []
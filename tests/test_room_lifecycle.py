@@ -0,0 +1,31 @@
+import room_lifecycle
+from room_lifecycle import RoomLifecycle
+
+
+def test_only_rooms_past_their_latest_deadline_are_due(monkeypatch):
+    now = {"t": 0.0}
+    monkeypatch.setattr(room_lifecycle.time, "monotonic", lambda: now["t"])
+    lifecycle = RoomLifecycle()
+    lifecycle.touch("A", 10)
+    lifecycle.touch("B", 20)
+    lifecycle.touch("A", 30)  # activity pushes A's deadline back
+
+    now["t"] = 25
+    assert lifecycle.pop_due() == ["B"]
+    assert not lifecycle.is_due("A")
+
+    now["t"] = 31
+    assert lifecycle.is_due("A")
+    assert lifecycle.pop_due() == ["A"]
+    assert lifecycle.pop_due() == []
+
+
+def test_forgotten_rooms_are_never_due(monkeypatch):
+    now = {"t": 0.0}
+    monkeypatch.setattr(room_lifecycle.time, "monotonic", lambda: now["t"])
+    lifecycle = RoomLifecycle()
+    lifecycle.touch("A", 1)
+    lifecycle.forget("A")
+    now["t"] = 5
+    assert lifecycle.pop_due() == []
+    assert len(lifecycle) == 0
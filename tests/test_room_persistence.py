@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from room_persistence import RoomWriteBehind
+
+
+def run_with_rooms(documents, updates, mode="async"):
+    """Apply updates through a RoomWriteBehind and return the stored documents"""
+    async def main():
+        collection = mongomock_motor.AsyncMongoMockClient()["test"]["game_rooms"]
+        if documents:
+            await collection.insert_many(documents)
+        writer = RoomWriteBehind(collection, mode=mode)
+        for code, fields in updates:
+            await writer.update(code, fields)
+        await writer.flush()
+        return {doc["_id"]: doc async for doc in collection.find({})}
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_stale_version_does_not_overwrite_a_newer_room(mode):
+    stored = run_with_rooms(
+        [{"_id": "A", "version": 5, "board": "new"}, {"_id": "B", "version": 2, "board": "old"}],
+        [("A", {"version": 4, "board": "stale"}), ("B", {"version": 3, "board": "newer"})],
+        mode)
+    assert stored["A"]["board"] == "new"
+    assert stored["B"] == {"_id": "B", "version": 3, "board": "newer"}
+
+
+def test_updates_without_a_version_always_apply():
+    stored = run_with_rooms([{"_id": "A", "version": 5}], [("A", {"status": "finished"})])
+    assert stored["A"] == {"_id": "A", "version": 5, "status": "finished"}
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_expired_room_is_recreated_from_a_full_write(mode):
+    fields = {"players": {"p1": "Ana"}, "player_symbols": {"p1": "X"}, "board": {"game_status": "playing"},
+              "version": 7}
+    stored = run_with_rooms([], [("A", fields)], mode)
+    assert {key: stored["A"][key] for key in fields} == fields
+    assert stored["A"]["room_code"] == "A"
+    assert "created_at" in stored["A"]
+
+
+def test_partial_write_to_an_expired_room_is_dropped():
+    stored = run_with_rooms([], [("A", {"board": {"game_status": "playing"}, "version": 2})])
+    assert stored == {}
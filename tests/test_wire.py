@@ -0,0 +1,54 @@
+import json
+from datetime import datetime
+
+import pytest
+
+import wire
+from wire import JSON, MSGPACK, decode_message, encode_message, negotiate_encoding
+
+msgpack = pytest.importorskip("msgpack")
+
+
+@pytest.mark.parametrize("subprotocols, query, expected", [
+    (None, None, (JSON, None)),
+    (["msgpack"], None, (MSGPACK, MSGPACK)),
+    (["other", "msgpack"], "json", (MSGPACK, MSGPACK)),
+    ([], "msgpack", (MSGPACK, None)),
+    (["other"], "cbor", (JSON, None)),
+])
+def test_negotiate_encoding(subprotocols, query, expected):
+    assert negotiate_encoding(subprotocols, query) == expected
+
+
+def test_without_msgpack_everything_is_json(monkeypatch):
+    monkeypatch.setattr(wire, "msgpack", None)
+    assert negotiate_encoding(["msgpack"], "msgpack") == (JSON, None)
+    with pytest.raises(ValueError):
+        decode_message({"type": "websocket.receive", "bytes": b"\x80"})
+
+
+def test_messages_round_trip_in_both_encodings():
+    message = {"type": "make_move", "cell_index": 4, "question": {"options": ["a", "b"]}}
+    binary = encode_message(message, MSGPACK)
+    assert isinstance(binary, bytes)
+    assert decode_message({"type": "websocket.receive", "bytes": binary}) == message
+    text = encode_message(message, JSON)
+    assert decode_message({"type": "websocket.receive", "text": text, "bytes": None}) == message
+
+
+ROOM = {"room_code": "ABC123", "created_at": datetime(2024, 5, 1, 12, 30, 15), "board": [None, "X"]}
+
+
+def test_datetimes_are_encoded_natively():
+    assert json.loads(wire.dumps(ROOM))["created_at"] == "2024-05-01T12:30:15"
+    assert msgpack.unpackb(encode_message(ROOM, MSGPACK), raw=False)["created_at"] == "2024-05-01T12:30:15"
+
+
+def test_fast_and_stdlib_json_agree():
+    assert json.loads(wire.dumps(ROOM)) == json.loads(json.dumps(ROOM, default=wire._default))
+    with pytest.raises(TypeError):
+        wire.dumps({"value": object()})
+
+
+def test_default_response_renders_room_documents():
+    assert json.loads(wire.DefaultResponse(ROOM).body)["created_at"] == "2024-05-01T12:30:15"